@@ -0,0 +1,157 @@
+"""
+NumPy tables for ``action_space.json`` and ``action_values.json``.
+
+The two JSON files map the 621 abstract moves of the policy head, spelled
+as rank strings with ``*`` for a free kicker, to their action ids and to
+(type, value) pairs. Here every abstract move is keyed by a packed count
+vector: 4 bits per slot for the 15 ranks and a 16th slot counting the
+``*`` kickers, so that a whole batch of moves is encoded with one
+``searchsorted`` and the legal moves of a decision become one boolean
+mask over the action space.
+
+Concrete moves, given as env card values, reach their abstract moves
+through ``specific_map`` in the compiled card index.
+"""
+
+import functools
+import json
+import os
+
+import numpy as np
+
+from perfectdou.card_index import load_card_index
+from perfectdou.cards import ENV_CARDS, KEY_BITS, RANKS
+
+ACTION_KEY_BITS = 4
+WILDCARD = "*"
+WILDCARD_SLOT = len(RANKS)
+DEFAULT_PATH = os.path.join(os.path.dirname(__file__), "data", "action_tables.npz")
+
+_ACTION_UNIT = {rank: 1 << (ACTION_KEY_BITS * slot) for slot, rank in enumerate(RANKS)}
+_ACTION_UNIT[WILDCARD] = 1 << (ACTION_KEY_BITS * WILDCARD_SLOT)
+_ENV_UNIT = {card: 1 << (KEY_BITS * slot) for slot, card in enumerate(ENV_CARDS)}
+
+
+def action_key(action):
+    """Packed key of an abstract move such as ``"333444**"``; "pass" is 0."""
+    if action == "pass":
+        return 0
+    key = 0
+    for rank in action:
+        key += _ACTION_UNIT[rank]
+    return key
+
+
+def env_keys(actions):
+    """``perfectdou.cards`` keys of a list of moves given as env card values."""
+    unit = _ENV_UNIT.__getitem__
+    return np.array([sum(map(unit, action)) for action in actions], dtype=np.uint64)
+
+
+def compile_action_tables(action_space_path, action_values_path, output_path):
+    """Compile the two JSON tables into an ``.npz``; returns the action count."""
+    with open(action_space_path) as f:
+        action_space = json.load(f)
+    with open(action_values_path) as f:
+        action_values = json.load(f)
+
+    actions = sorted(action_space, key=action_space.get)
+    if [action_space[action] for action in actions] != list(range(len(actions))):
+        raise ValueError("Action ids in {} are not 0..n-1".format(action_space_path))
+    keys = np.array([action_key(action) for action in actions], dtype=np.uint64)
+    order = np.argsort(keys, kind="stable")
+    value_keys = np.array([action_key(action) for action in action_values], np.uint64)
+    value_order = np.argsort(value_keys, kind="stable")
+    values = np.array(list(action_values.values()), dtype=np.float64)
+    np.savez(
+        output_path,
+        actions=np.array(actions),
+        action_keys=keys[order],
+        action_ids=order.astype(np.int32),
+        value_keys=value_keys[value_order],
+        values=values[value_order],
+    )
+    return len(actions)
+
+
+class ActionTables:
+    """The compiled action space, with vectorized encode and decode."""
+
+    def __init__(self, path=DEFAULT_PATH):
+        with np.load(path, allow_pickle=False) as data:
+            self.actions = data["actions"]
+            self.action_keys = data["action_keys"]
+            self.action_ids = data["action_ids"]
+            self.value_keys = data["value_keys"]
+            self.values = data["values"]
+        self.num_actions = len(self.actions)
+        # (type, value) of every action id; -1 for moves without one.
+        self.action_values = np.full((self.num_actions, 2), -1.0)
+        rows = self._find(self.value_keys, self.action_keys)
+        found = rows >= 0
+        self.action_values[self.action_ids[found]] = self.values[rows[found]]
+
+        # Action ids of the abstract moves of every card index row, padded
+        # with num_actions, which masks write into a spare last slot.
+        index = load_card_index()
+        self._card_keys = index.keys
+        offsets = index.specific_offsets.astype(np.int64)
+        counts = np.diff(offsets)
+        name_ids = self.encode([action_key(name) for name in index.specific_names])
+        self._row_ids = np.full((len(counts), max(counts.max(), 1)), self.num_actions)
+        for option in range(self._row_ids.shape[1]):
+            rows = np.flatnonzero(counts > option)
+            self._row_ids[rows, option] = name_ids[
+                index.specific_entries[offsets[rows] + option]
+            ]
+        self._first_ids = np.ascontiguousarray(self._row_ids[:, 0])
+
+    @staticmethod
+    def _find(sorted_keys, keys):
+        """Positions of ``keys`` in ``sorted_keys``, -1 where absent."""
+        keys = np.asarray(keys, dtype=np.uint64)
+        rows = sorted_keys.searchsorted(keys)
+        return np.where(sorted_keys.take(rows, mode="clip") == keys, rows, -1)
+
+    def encode(self, keys):
+        """Action ids of packed abstract keys; -1 for unknown moves."""
+        rows = self._find(self.action_keys, keys)
+        return np.where(rows >= 0, self.action_ids[rows], -1)
+
+    def decode(self, ids):
+        """Abstract move strings of action ids."""
+        return self.actions[np.asarray(ids)].tolist()
+
+    def mask(self, keys):
+        """Boolean mask over the action space of packed abstract keys."""
+        mask = np.zeros(self.num_actions, dtype=bool)
+        ids = self.encode(keys)
+        mask[ids[ids >= 0]] = True
+        return mask
+
+    def _card_rows(self, actions):
+        keys = env_keys(actions)
+        rows = self._card_keys.searchsorted(keys)
+        found = self._card_keys.take(rows, mode="clip") == keys
+        if not found.all():
+            raise KeyError("Not a legal move: {}".format(actions[int(found.argmin())]))
+        return rows
+
+    def legal_action_ids(self, actions):
+        """
+        Action id of each move given as env card values, using the first
+        abstract move ``specific_map`` lists for it.
+        """
+        return self._first_ids.take(self._card_rows(actions))
+
+    def legal_action_mask(self, actions):
+        """Mask of every abstract move that the given env moves can be played as."""
+        mask = np.zeros(self.num_actions + 1, dtype=bool)
+        mask[self._row_ids.take(self._card_rows(actions), axis=0)] = True
+        return mask[:-1]
+
+
+@functools.lru_cache(maxsize=None)
+def load_action_tables(path=DEFAULT_PATH):
+    """The process-wide ``ActionTables`` of ``path``."""
+    return ActionTables(path)
@@ -2,11 +2,36 @@
 PerfectDou 实战助手模块
 
 提供实际斗地主对战中的AI决策支持和游戏状态管理功能。
+
+各子模块在首次访问对应名称时才导入，只用到牌型解析时无需加载
+游戏状态、决策顾问和交互界面。AI 智能体本身也在第一次请求建议时
+才由 AIAdvisor 加载。
 """
 
-from .card_parser import CardParser
-from .game_state import GameState, Position
-from .ai_advisor import AIAdvisor
-from .battle_interface import BattleInterface
+import importlib
+
+__all__ = ['CardParser', 'GameState', 'Position', 'AIAdvisor', 'AdvicePrefetcher',
+           'BattleInterface']
+
+# 对外名称 -> 定义它的子模块
+_SUBMODULES = {
+    'CardParser': '.card_parser',
+    'GameState': '.game_state',
+    'Position': '.game_state',
+    'AIAdvisor': '.ai_advisor',
+    'AdvicePrefetcher': '.prefetch',
+    'BattleInterface': '.battle_interface',
+}
+
+
+def __getattr__(name: str):
+    """按需导入子模块（PEP 562）"""
+    if name not in _SUBMODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_SUBMODULES[name], __name__), name)
+    globals()[name] = value
+    return value
+
 
-__all__ = ['CardParser', 'GameState', 'Position', 'AIAdvisor', 'BattleInterface']
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -4,14 +4,13 @@ AI决策顾问模块
 集成PerfectDou智能体，为用户提供出牌建议和策略分析。
 """
 
-import os
-import sys
+from collections import OrderedDict
 from typing import List, Dict, Optional, Tuple, Any
-from dataclasses import dataclass
-
-# 添加项目根目录到路径
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+from dataclasses import dataclass, replace
 
+from perfectdou.cards import env_key, key_env_cards
+from perfectdou.hand import Hand
+from perfectdou.moves import follow_moves, lead_moves
 from .game_state import GameState, Position, MoveRecord
 from .card_parser import CardParser
 
@@ -26,6 +25,10 @@ class MoveAdvice:
     reasoning: str     # 推理说明
 
 
+# 默认缓存的局面数
+ADVICE_CACHE_SIZE = 256
+
+
 class MockInfoSet:
     """模拟信息集，用于适配PerfectDou智能体接口"""
     
@@ -43,12 +46,23 @@ class MockInfoSet:
 class AIAdvisor:
     """AI决策顾问"""
     
-    def __init__(self):
-        """初始化AI顾问"""
+    def __init__(self, cache_size: int = ADVICE_CACHE_SIZE):
+        """
+        初始化AI顾问
+        
+        Args:
+            cache_size: 按局面指纹缓存建议的最大局面数，0 表示不缓存
+        """
         self.card_parser = CardParser()
         self._perfectdou_agent = None
         self._rlcard_agent = None
         self._agents_loaded = False
+        
+        # LRU 缓存：(局面指纹, 建议数量) -> 建议列表
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple, List[MoveAdvice]]" = OrderedDict()
+        self._cache_hits = 0
+        self._cache_misses = 0
     
     def _load_agents(self):
         """延迟加载AI智能体"""
@@ -92,17 +106,23 @@ class AIAdvisor:
             
         Returns:
             出牌建议列表
+            
+        同一局面（指纹相同）的建议直接从缓存返回，不再生成出牌和运行智能体。
         """
-        self._load_agents()
-        
         if not game_state.players[game_state.user_position].is_user:
             return []
         
+        cache_key = (game_state.fingerprint(), num_suggestions)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
+        self._load_agents()
+        
         # 获取合法出牌上下文
         context = game_state.get_legal_moves_context()
-        user_cards = context["user_cards"]
         
-        if not user_cards:
+        if not context["user_hand"]:
             return []
         
         # 生成合法出牌选项
@@ -116,11 +136,51 @@ class AIAdvisor:
             legal_moves, ai_suggestions, num_suggestions
         )
         
+        self._cache_put(cache_key, advice_list)
         return advice_list
     
+    def cache_stats(self) -> Dict[str, int]:
+        """获取建议缓存的统计信息"""
+        return {
+            "hits": self._cache_hits,
+            "misses": self._cache_misses,
+            "size": len(self._cache),
+            "maxsize": self.cache_size,
+        }
+    
+    def clear_cache(self):
+        """清空建议缓存及其统计"""
+        self._cache.clear()
+        self._cache_hits = 0
+        self._cache_misses = 0
+    
+    @staticmethod
+    def _copy_advice(advice_list: List[MoveAdvice]) -> List[MoveAdvice]:
+        """复制建议列表，调用方修改返回值不会影响缓存"""
+        return [replace(advice, cards=list(advice.cards)) for advice in advice_list]
+    
+    def _cache_get(self, key: Tuple) -> Optional[List[MoveAdvice]]:
+        if not self.cache_size:
+            return None
+        advice_list = self._cache.get(key)
+        if advice_list is None:
+            self._cache_misses += 1
+            return None
+        self._cache.move_to_end(key)
+        self._cache_hits += 1
+        return self._copy_advice(advice_list)
+    
+    def _cache_put(self, key: Tuple, advice_list: List[MoveAdvice]):
+        if not self.cache_size:
+            return
+        self._cache[key] = self._copy_advice(advice_list)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+    
     def _generate_legal_moves(self, context: Dict) -> List[List[int]]:
         """生成合法出牌选项"""
-        user_cards = context["user_cards"]
+        user_hand = context["user_hand"]
         legal_moves = []
         
         # 总是可以过牌（如果需要跟牌）
@@ -129,83 +189,33 @@ class AIAdvisor:
         
         # 如果不需要跟牌，可以出任意合法牌型
         if not context["need_follow"]:
-            legal_moves.extend(self._generate_all_possible_moves(user_cards))
+            legal_moves.extend(self._generate_all_possible_moves(user_hand))
         else:
             # 需要跟牌，生成能够压过上家的牌型
             last_move = context.get("last_valid_move")
             if last_move:
                 legal_moves.extend(
-                    self._generate_following_moves(user_cards, last_move["cards"])
+                    self._generate_following_moves(user_hand, last_move["cards"])
                 )
         
         return legal_moves
     
-    def _generate_all_possible_moves(self, cards: List[int]) -> List[List[int]]:
-        """生成所有可能的出牌组合"""
-        moves = []
-        
-        # 单牌
-        for card in set(cards):
-            moves.append([card])
-        
-        # 对子
-        card_counts = {}
-        for card in cards:
-            card_counts[card] = card_counts.get(card, 0) + 1
-        
-        for card, count in card_counts.items():
-            if count >= 2:
-                moves.append([card, card])
-            if count >= 3:
-                moves.append([card, card, card])
-            if count >= 4:
-                moves.append([card, card, card, card])
-        
-        # 王炸
-        if 20 in cards and 30 in cards:
-            moves.append([20, 30])
-        
-        # 简化版：只返回基本牌型
-        return moves[:20]  # 限制数量避免过多选项
+    def _generate_all_possible_moves(self, hand: Hand) -> List[List[int]]:
+        """生成所有可以首出的牌型（与 card_type.json 的规则一致）"""
+        return [key_env_cards(key) for key in lead_moves(hand.counts())]
     
-    def _generate_following_moves(self, cards: List[int], 
+    def _generate_following_moves(self, hand: Hand, 
                                 last_cards: List[int]) -> List[List[int]]:
-        """生成跟牌选项"""
-        moves = []
-        last_count = len(last_cards)
-        
-        if last_count == 1:  # 跟单牌
-            last_value = last_cards[0]
-            for card in cards:
-                if card > last_value:
-                    moves.append([card])
-        elif last_count == 2:  # 跟对子或王炸
-            if last_cards == [20, 30]:  # 王炸无法跟
-                return moves
-            elif last_cards[0] == last_cards[1]:  # 跟对子
-                last_value = last_cards[0]
-                card_counts = {}
-                for card in cards:
-                    card_counts[card] = card_counts.get(card, 0) + 1
-                for card, count in card_counts.items():
-                    if count >= 2 and card > last_value:
-                        moves.append([card, card])
-        
-        # 炸弹可以压任何牌型（除了更大的炸弹）
-        card_counts = {}
-        for card in cards:
-            card_counts[card] = card_counts.get(card, 0) + 1
-        
-        for card, count in card_counts.items():
-            if count >= 4:
-                if last_count != 4 or card > last_cards[0]:
-                    moves.append([card, card, card, card])
-        
-        # 王炸可以压任何牌型
-        if 20 in cards and 30 in cards and last_cards != [20, 30]:
-            moves.append([20, 30])
-        
-        return moves
+        """生成能压过上家的出牌（同牌型且更大，或炸弹、王炸），不含过牌"""
+        # 牌型表依赖 NumPy，首次跟牌时才加载
+        from perfectdou.evaluation.card_types import card_type_table
+        card_types = card_type_table()
+        last_key = env_key(last_cards)
+        if last_key not in card_types.types:
+            # 上家的出牌不是合法牌型，无法跟牌
+            return []
+        return [key_env_cards(key)
+                for key in follow_moves(hand.counts(), last_key, card_types)]
     
     def _get_ai_suggestions(self, game_state: GameState, 
                           legal_moves: List[List[int]]) -> List[List[int]]:
@@ -217,20 +227,18 @@ class AIAdvisor:
         user_position = game_state.user_position.value
         user_cards = game_state.get_user_hand_cards()
         
-        # 获取最近的出牌历史
+        # 获取最近的出牌历史，与游戏环境的信息集一致：
+        # last_move 和 last_pid 是要压过的出牌及其出牌者（过牌不算），
+        # last_two_moves 最近的一手在前，历史不足两手时用空列表补齐
         last_move = []
-        last_two_moves = [[], []]
         last_pid = ""
         
-        if game_state.last_move:
-            last_move = game_state.last_move.cards
-            last_pid = game_state.last_move.position.value
+        if game_state.need_follow and game_state.last_valid_move:
+            last_move = game_state.last_valid_move.cards
+            last_pid = game_state.last_valid_move.position.value
         
-        if len(game_state.move_history) >= 2:
-            last_two_moves = [
-                game_state.move_history[-2].cards,
-                game_state.move_history[-1].cards
-            ]
+        last_two_moves = [move.cards for move in reversed(game_state.move_history[-2:])]
+        last_two_moves += [[]] * (2 - len(last_two_moves))
         
         # 创建模拟信息集
         info_set = MockInfoSet(
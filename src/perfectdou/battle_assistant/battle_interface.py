@@ -9,16 +9,23 @@ import sys
 from typing import List, Optional, Dict
 from .game_state import GameState, Position
 from .card_parser import CardParser
-from .ai_advisor import AIAdvisor
+from .ai_advisor import AIAdvisor, MoveAdvice
+from .prefetch import AdvicePrefetcher
 
 
 class BattleInterface:
     """斗地主实战交互界面"""
     
-    def __init__(self):
-        """初始化界面"""
+    def __init__(self, prefetch: bool = True):
+        """
+        初始化界面
+        
+        Args:
+            prefetch: 是否在对手回合后台预取AI建议
+        """
         self.card_parser = CardParser()
         self.ai_advisor = AIAdvisor()
+        self.prefetcher = AdvicePrefetcher(self.ai_advisor) if prefetch else None
         self.game_state: Optional[GameState] = None
         
     def start_battle(self):
@@ -30,7 +37,11 @@ class BattleInterface:
             return
         
         # 主游戏循环
-        self._game_loop()
+        try:
+            self._game_loop()
+        finally:
+            if self.prefetcher:
+                self.prefetcher.close()
         
     def _print_welcome(self):
         """打印欢迎信息"""
@@ -222,7 +233,7 @@ class BattleInterface:
         print(f"\n🎯 轮到您出牌！")
         
         # 获取AI建议
-        advice_list = self.ai_advisor.get_move_advice(self.game_state)
+        advice_list = self._get_advice()
         
         if advice_list:
             print("\n🤖 AI建议：")
@@ -264,8 +275,18 @@ class BattleInterface:
             except KeyboardInterrupt:
                 return False
     
+    def _get_advice(self) -> List[MoveAdvice]:
+        """获取当前局面的AI建议，优先使用对手回合预取的结果"""
+        if self.prefetcher:
+            return self.prefetcher.get_advice(self.game_state)
+        return self.ai_advisor.get_move_advice(self.game_state)
+    
     def _handle_opponent_turn(self) -> bool:
         """处理对手回合"""
+        # 用户录入对手出牌期间，在后台为接下来的局面准备建议
+        if self.prefetcher:
+            self.prefetcher.schedule(self.game_state)
+        
         current_pos = self._position_to_chinese(self.game_state.current_player)
         print(f"\n⏳ 等待 {current_pos} 出牌...")
         
@@ -7,6 +7,8 @@
 import re
 from typing import List, Dict, Union, Optional
 
+from perfectdou.hand import Hand
+
 
 class CardParser:
     """牌型解析器，支持多种输入格式"""
@@ -160,21 +162,11 @@ class CardParser:
         return [self.ENV_CARD_MAPPING.get(card, card) for card in cards]
     
     def validate_cards(self, cards: List[int]) -> bool:
-        """验证牌型是否合法（不超过标准牌数）"""
-        # 统计每种牌的数量
-        card_count = {}
-        for card in cards:
-            card_count[card] = card_count.get(card, 0) + 1
-        
-        # 检查数量限制
-        for card, count in card_count.items():
-            if card in [20, 30]:  # 王牌只能有1张
-                if count > 1:
-                    return False
-            else:  # 其他牌最多4张
-                if count > 4:
-                    return False
-        
+        """验证牌型是否合法（都是有效牌值，且不超过一副牌的张数）"""
+        try:
+            Hand(cards)
+        except ValueError:
+            return False
         return True
     
     def get_card_type_info(self, cards: List[int]) -> Dict[str, Union[str, int]]:
@@ -7,6 +7,9 @@
 from typing import List, Dict, Optional, Tuple
 from enum import Enum
 from dataclasses import dataclass, field
+
+from perfectdou.cards import env_key
+from perfectdou.hand import Hand
 from .card_parser import CardParser
 
 
@@ -38,10 +41,15 @@ class MoveRecord:
 class PlayerInfo:
     """玩家信息"""
     position: Position
-    hand_cards: List[int] = field(default_factory=list)
+    hand: Hand = field(default_factory=Hand)
     played_cards: List[int] = field(default_factory=list)
     remaining_count: int = 0
     is_user: bool = False
+    
+    @property
+    def hand_cards(self) -> List[int]:
+        """手牌的列表形式（从小到大排序）"""
+        return self.hand.cards()
 
 
 class GameState:
@@ -94,7 +102,7 @@ class GameState:
                 return False
             
             # 设置用户手牌
-            self.players[self.user_position].hand_cards = sorted(user_cards)
+            self.players[self.user_position].hand = Hand(user_cards)
             self.players[self.user_position].remaining_count = len(user_cards)
             
             # 如果用户是地主，设置底牌
@@ -103,9 +111,9 @@ class GameState:
                     return False
                 self.three_landlord_cards = sorted(landlord_cards)
                 # 地主手牌包含底牌
-                all_landlord_cards = user_cards + landlord_cards
-                self.players[Position.LANDLORD].hand_cards = sorted(all_landlord_cards)
-                self.players[Position.LANDLORD].remaining_count = len(all_landlord_cards)
+                landlord_hand = Hand(user_cards) + landlord_cards
+                self.players[Position.LANDLORD].hand = landlord_hand
+                self.players[Position.LANDLORD].remaining_count = len(landlord_hand)
             
             # 估算其他玩家的手牌数量
             if self.user_position == Position.LANDLORD:
@@ -162,11 +170,10 @@ class GameState:
                 
                 # 更新玩家手牌（如果是用户）
                 if position == self.user_position:
-                    for card in cards:
-                        if card in self.players[position].hand_cards:
-                            self.players[position].hand_cards.remove(card)
-                        else:
-                            return False  # 用户没有这张牌
+                    player = self.players[position]
+                    if not player.hand.contains(cards):
+                        return False  # 用户没有这些牌
+                    player.hand = player.hand - cards
                 
                 # 更新已出牌记录
                 self.players[position].played_cards.extend(cards)
@@ -225,9 +232,39 @@ class GameState:
             }
         }
     
+    def get_user_hand(self) -> Hand:
+        """获取用户当前手牌（不可变的 Hand）"""
+        return self.players[self.user_position].hand
+    
     def get_user_hand_cards(self) -> List[int]:
         """获取用户当前手牌"""
-        return self.players[self.user_position].hand_cards.copy()
+        return self.get_user_hand().cards()
+    
+    def fingerprint(self) -> Tuple:
+        """
+        获取决定 AI 建议的局面指纹（可哈希）
+        
+        由用户位置、用户手牌、是否需要跟牌、要压过的出牌、其后连续过牌的次数和
+        完整出牌历史组成，覆盖 AIAdvisor 构造信息集时读取的全部内容。出牌和重置
+        都会改变历史，因此指纹相同的两个局面总是得到相同的建议。
+        """
+        def move_key(move: MoveRecord) -> Tuple[str, int]:
+            return (move.position.value, env_key(move.cards))
+        
+        pass_count = 0
+        for move in reversed(self.move_history):
+            if move.cards:
+                break
+            pass_count += 1
+        
+        return (
+            self.user_position.value,
+            self.get_user_hand().key,
+            self.need_follow,
+            move_key(self.last_valid_move) if self.last_valid_move else None,
+            pass_count,
+            tuple(move_key(move) for move in self.move_history),
+        )
     
     def get_legal_moves_context(self) -> Dict:
         """获取合法出牌的上下文信息"""
@@ -235,6 +272,7 @@ class GameState:
             "need_follow": self.need_follow,
             "last_valid_move": None,
             "user_cards": self.get_user_hand_cards(),
+            "user_hand": self.get_user_hand(),
             "can_pass": self.need_follow
         }
         
@@ -259,6 +297,6 @@ class GameState:
         self.last_valid_move = None
         
         for player in self.players.values():
-            player.hand_cards = []
+            player.hand = Hand()
             player.played_cards = []
             player.remaining_count = 0
@@ -0,0 +1,161 @@
+"""
+AI建议预取模块
+
+对手回合里用户要把对手的出牌逐个录入，这段时间顾问一直空闲。预取器在
+后台线程中为轮到用户时最可能出现的几个局面（对手过牌，或用最小的同型
+牌压过上一手）提前计算建议，并按局面指纹保存。轮到用户时真实局面与某个
+预测一致就直接取用，其余预测作废。
+"""
+
+import copy
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from perfectdou.cards import env_key, key_env_cards
+from perfectdou.hand import DECK
+from perfectdou.moves import follow_moves
+from .ai_advisor import AIAdvisor, MoveAdvice
+from .game_state import GameState, GamePhase
+
+
+# 每次最多预测的局面数（两个对手各两种应对）
+MAX_PREDICTIONS = 4
+
+
+class AdvicePrefetcher:
+    """在对手回合后台预取AI建议"""
+
+    def __init__(self, advisor: AIAdvisor, num_suggestions: int = 3,
+                 max_predictions: int = MAX_PREDICTIONS):
+        """
+        初始化预取器
+
+        Args:
+            advisor: 计算建议的AI顾问
+            num_suggestions: 每个局面的建议数量
+            max_predictions: 每次最多预测的局面数
+        """
+        self.advisor = advisor
+        self.num_suggestions = num_suggestions
+        self.max_predictions = max_predictions
+        # 智能体带有可变的输入缓冲区，同一时间只允许一个线程使用顾问
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Dict[Tuple, Future] = {}
+        self.stats = {"hits": 0, "misses": 0, "discarded": 0}
+
+    def schedule(self, game_state: GameState):
+        """
+        在对手回合调用：预测轮到用户时的局面并在后台计算建议
+
+        已在计算且仍可能出现的局面保留，不再可能出现的局面取消。
+        """
+        predictions = {state.fingerprint(): state
+                       for state in self.predict(game_state)}
+        for fingerprint in list(self._pending):
+            if fingerprint not in predictions:
+                self._discard(fingerprint)
+        for fingerprint, state in predictions.items():
+            if fingerprint not in self._pending:
+                self._pending[fingerprint] = self._submit(state)
+
+    def get_advice(self, game_state: GameState) -> List[MoveAdvice]:
+        """
+        在用户回合调用：命中预测时返回预取的建议（仍在计算则等待其完成），
+        否则同步计算。其余预测全部作废。
+        """
+        future = self._pending.pop(game_state.fingerprint(), None)
+        self.cancel()
+        if future is not None and not future.cancelled():
+            try:
+                advice = future.result()
+            except Exception as e:
+                print(f"预取建议失败: {e}")
+            else:
+                self.stats["hits"] += 1
+                return advice
+        self.stats["misses"] += 1
+        return self._advise(game_state)
+
+    def cancel(self):
+        """作废所有预测"""
+        for fingerprint in list(self._pending):
+            self._discard(fingerprint)
+
+    def close(self):
+        """作废所有预测并关闭后台线程"""
+        self.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def predict(self, game_state: GameState) -> List[GameState]:
+        """轮到用户时最可能出现的局面，按可能性从高到低排列"""
+        if game_state.phase != GamePhase.PLAYING:
+            return []
+        states = [game_state]
+        while states and states[0].current_player != game_state.user_position:
+            successors = []
+            for state in states:
+                for cards in self._likely_moves(state):
+                    successor = copy.deepcopy(state)
+                    if (successor.make_move(successor.current_player, cards)
+                            and successor.phase == GamePhase.PLAYING):
+                        successors.append(successor)
+            states = successors[:self.max_predictions]
+        # 当前就是用户回合时没有需要预测的局面
+        return states if states and states[0] is not game_state else []
+
+    def _likely_moves(self, game_state: GameState) -> List[List[int]]:
+        """对手最可能的出牌：过牌，以及用未出现的牌中最小的同型牌压过上一手"""
+        moves = [[]]
+        last_move = game_state.last_valid_move
+        if game_state.need_follow and last_move is not None and last_move.cards:
+            response = self._lowest_response(game_state, last_move.cards)
+            if response:
+                moves.append(response)
+        return moves
+
+    def _lowest_response(self, game_state: GameState,
+                         last_cards: List[int]) -> Optional[List[int]]:
+        """当前对手能用来压过 last_cards 的最小同型牌（只考虑用户看不到的牌）"""
+        # 牌型表依赖 NumPy，首次预测时才加载
+        from perfectdou.evaluation.card_types import card_type_table
+        card_types = card_type_table()
+        last_key = env_key(last_cards)
+        if last_key not in card_types.types:
+            return None
+        try:
+            seen = game_state.get_user_hand()
+            for player in game_state.players.values():
+                seen = seen + player.played_cards
+            unseen = DECK - seen
+        except ValueError:
+            # 录入的出牌超出了一副牌，无法推断
+            return None
+        last_type = card_types.types[last_key][0]
+        max_size = game_state.players[game_state.current_player].remaining_count
+        candidates = [
+            key for key in follow_moves(unseen.counts(), last_key, card_types)
+            if card_types.types[key][0] == last_type
+            and len(key_env_cards(key)) <= max_size
+        ]
+        if not candidates:
+            return None
+        return key_env_cards(min(candidates, key=lambda key: card_types.types[key][1]))
+
+    def _advise(self, game_state: GameState) -> List[MoveAdvice]:
+        with self._lock:
+            return self.advisor.get_move_advice(game_state, self.num_suggestions)
+
+    def _submit(self, game_state: GameState) -> Future:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="advice-prefetch")
+        return self._executor.submit(self._advise, game_state)
+
+    def _discard(self, fingerprint: Tuple):
+        # 已开始的计算无法中断，结果直接丢弃
+        self._pending.pop(fingerprint).cancel()
+        self.stats["discarded"] += 1
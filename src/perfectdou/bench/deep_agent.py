@@ -0,0 +1,104 @@
+"""
+DouZero decision latency before and after sharing the LSTM history.
+
+Plays a handful of seeded random games, records every observation seen
+from ``--position`` and times the model on each of them through the
+per-action history batch (``forward``) and the shared history
+(``predict``). Also checks that both paths give the same values.
+
+    python -m perfectdou.bench.deep_agent --model baselines/douzero_ADP/landlord.ckpt
+"""
+
+import argparse
+import json
+import random
+
+import numpy as np
+import torch
+
+from perfectdou.bench.timing import percentile_summary, time_calls
+from perfectdou.env.env import get_obs
+from perfectdou.env.game import GameEnv
+from perfectdou.evaluation.deep_agent import _load_model
+from perfectdou.evaluation.random_agent import RandomAgent
+
+
+class _RecordingRandomAgent(RandomAgent):
+    def __init__(self, observations):
+        super().__init__()
+        self.observations = observations
+
+    def act(self, infoset):
+        if len(infoset.legal_actions) > 1:
+            self.observations.append(get_obs(infoset))
+        return super().act(infoset)
+
+
+def record_observations(position, num_games, seed):
+    from perfectdou.cli.generate_eval_data import generate_block
+    from perfectdou.evaluation.deal_file import card_play_data_from_row
+
+    random.seed(seed)
+    observations = []
+    players = {
+        pos: _RecordingRandomAgent(observations) if pos == position else RandomAgent()
+        for pos in ["landlord", "landlord_up", "landlord_down"]
+    }
+    env = GameEnv(players)
+    for row in generate_block(seed, 0, num_games):
+        env.card_play_init(card_play_data_from_row(row))
+        while not env.game_over:
+            env.step()
+        env.reset()
+    return observations
+
+
+def main():
+    parser = argparse.ArgumentParser("DouZero history-sharing benchmark")
+    parser.add_argument("--model", type=str, required=True)
+    parser.add_argument("--position", type=str, default="landlord")
+    parser.add_argument("--num_games", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--num_threads", type=int, default=1)
+    args = parser.parse_args()
+
+    torch.set_num_threads(args.num_threads)
+    model = _load_model(args.position, args.model)
+    observations = record_observations(args.position, args.num_games, args.seed)
+    device = next(model.parameters()).device
+    inputs = [
+        (
+            torch.from_numpy(obs["z_batch"]).float().to(device),
+            torch.from_numpy(obs["z"][np.newaxis]).float().to(device),
+            torch.from_numpy(obs["x_batch"]).float().to(device),
+        )
+        for obs in observations
+    ]
+
+    def per_action_history(item):
+        with torch.no_grad():
+            return model.forward(item[0], item[2], return_value=True)["values"]
+
+    def shared_history(item):
+        with torch.no_grad():
+            return model.predict(item[1], item[2])
+
+    max_abs_diff = max(
+        float((per_action_history(item) - shared_history(item)).abs().max())
+        for item in inputs
+    )
+    report = {
+        "position": args.position,
+        "decisions": len(inputs),
+        "mean_legal_actions": float(np.mean([item[2].shape[0] for item in inputs])),
+        "max_abs_diff": max_abs_diff,
+        "per_action_history": percentile_summary(
+            time_calls(per_action_history, inputs)
+        ),
+        "shared_history": percentile_summary(time_calls(shared_history, inputs)),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+PerfectDou ``act`` latency with and without the preallocated input path.
+
+Plays a handful of seeded random games, keeps a copy of every infoset
+seen from ``--position`` and times a full decision (encode, inference,
+decode) on each of them the way ``act`` used to do it (fresh
+concatenated input, name lookup and ``run()`` per call) and through the
+current ``act`` (reused float32 row bound with IOBinding). Also checks
+that both choose the same actions.
+
+    python -m perfectdou.bench.perfectdou_agent --position landlord
+"""
+
+import argparse
+import json
+
+import numpy as np
+
+from perfectdou.bench.recording import record_infosets
+from perfectdou.bench.timing import percentile_summary, time_calls
+from perfectdou.evaluation.perfectdou_agent import PerfectDouAgent
+
+
+def legacy_act(agent, infoset):
+    """``act`` before the preallocated path, kept for comparison."""
+    obs = agent._encode_obs(infoset)
+    input_data = np.concatenate(
+        [obs["x_no_action"].flatten(), obs["legal_actions_arr"].flatten()]
+    ).astype(agent.input_dtype, copy=False)
+    input_name = agent.model.get_inputs()[0].name
+    logit = agent.model.run(["action_logit"], {input_name: input_data.reshape(1, -1)})
+    return agent._decode(logit, obs)
+
+
+def main():
+    parser = argparse.ArgumentParser("PerfectDou act latency benchmark")
+    parser.add_argument("--position", type=str, default="landlord")
+    parser.add_argument("--num_games", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--intra_op_threads", type=int, default=1)
+    args = parser.parse_args()
+
+    agent = PerfectDouAgent(args.position, args.intra_op_threads)
+    infosets = record_infosets(args.position, args.num_games, args.seed)
+    num_mismatches = sum(
+        legacy_act(agent, infoset) != agent.act(infoset) for infoset in infosets
+    )
+    report = {
+        "position": args.position,
+        "decisions": len(infosets),
+        "io_binding": agent._binding is not None,
+        "mismatched_actions": num_mismatches,
+        "legacy_act": percentile_summary(
+            time_calls(lambda infoset: legacy_act(agent, infoset), infosets)
+        ),
+        "act": percentile_summary(time_calls(agent.act, infosets)),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Accept or reject a quantized PerfectDou variant on numbers.
+
+Records the network inputs PerfectDou sees while playing seeded games
+against itself, replays them through the fp32 and the ``--variant``
+graphs and reports how often both pick the same action, how far the
+logits move and the latency of each. With ``--eval_data`` it also plays
+the 2 x 2 tournament of fp32 against the variant on that deal set and
+reports the WP/ADP change of the variant in either role.
+
+    python -m perfectdou.bench.quantization --check_games 20 --eval_data eval_data.deals
+"""
+
+import argparse
+import json
+
+import numpy as np
+
+from perfectdou.bench.timing import percentile_summary, time_calls
+from perfectdou.env.game import GameEnv
+from perfectdou.evaluation.perfectdou_agent import PerfectDouAgent
+
+POSITIONS = ["landlord", "landlord_up", "landlord_down"]
+
+
+class _RecordingPerfectDouAgent(PerfectDouAgent):
+    def __init__(self, position, inputs):
+        super().__init__(position)
+        self.inputs = inputs
+
+    def act(self, infoset):
+        self.inputs.append(self._encode(infoset)[1])
+        return super().act(infoset)
+
+
+def record_inputs(num_games, seed):
+    """``{position: [input row, ...]}`` from fp32 PerfectDou self-play."""
+    from perfectdou.cli.generate_eval_data import generate_block
+    from perfectdou.evaluation.deal_file import card_play_data_from_row
+
+    inputs = {position: [] for position in POSITIONS}
+    players = {
+        position: _RecordingPerfectDouAgent(position, inputs[position])
+        for position in POSITIONS
+    }
+    env = GameEnv(players)
+    for row in generate_block(seed, 0, num_games):
+        env.card_play_init(card_play_data_from_row(row))
+        while not env.game_over:
+            env.step()
+        env.reset()
+    return inputs
+
+
+def _logits(agent, input_row):
+    return agent.model.run(
+        [agent.output_name], {agent.input_name: input_row[np.newaxis]}
+    )[0]
+
+
+def compare_decisions(reference, candidate, inputs):
+    """Argmax agreement, logit drift and latency of two agents on ``inputs``."""
+    num_agreed = 0
+    max_abs_diff = 0.0
+    for input_row in inputs:
+        expected = _logits(reference, input_row)
+        logits = _logits(candidate, input_row)
+        num_agreed += int(np.argmax(expected) == np.argmax(logits))
+        max_abs_diff = max(max_abs_diff, float(np.abs(logits - expected).max()))
+    return {
+        "decisions": len(inputs),
+        "agreement": num_agreed / max(len(inputs), 1),
+        "max_abs_logit_diff": max_abs_diff,
+        "reference_latency": percentile_summary(
+            time_calls(lambda row: _logits(reference, row), inputs)
+        ),
+        "candidate_latency": percentile_summary(
+            time_calls(lambda row: _logits(candidate, row), inputs)
+        ),
+    }
+
+
+def outcome_change(variant_spec, eval_data, num_workers, lockstep_games=0):
+    """
+    Landlord WP/ADP of the variant minus fp32 in each role, both measured
+    against fp32 on the same deals.
+    """
+    from perfectdou.evaluation.tournament import tournament
+
+    cells = tournament(
+        ["perfectdou", variant_spec],
+        eval_data,
+        num_workers,
+        lockstep_games=lockstep_games,
+    )["cells"]
+    baseline = cells[0][0]
+    return {
+        "games": baseline["games"],
+        "fp32": {"wp": baseline["wp"], "adp": baseline["adp"]},
+        "as_landlord": {
+            "wp_delta": cells[1][0]["wp"] - baseline["wp"],
+            "adp_delta": cells[1][0]["adp"] - baseline["adp"],
+        },
+        # Farmers gain what the landlord loses.
+        "as_farmers": {
+            "wp_delta": baseline["wp"] - cells[0][1]["wp"],
+            "adp_delta": baseline["adp"] - cells[0][1]["adp"],
+        },
+    }
+
+
+def check_variant(
+    variant, check_games=20, seed=0, eval_data=None, num_workers=5, lockstep_games=0
+):
+    inputs = record_inputs(check_games, seed)
+    report = {"variant": variant, "decisions": {}}
+    for position in POSITIONS:
+        report["decisions"][position] = compare_decisions(
+            PerfectDouAgent(position),
+            PerfectDouAgent(position, variant=variant),
+            inputs[position],
+        )
+    report["agreement"] = min(
+        result["agreement"] for result in report["decisions"].values()
+    )
+    if eval_data is not None:
+        report["outcomes"] = outcome_change(
+            "perfectdou_{}".format(variant), eval_data, num_workers, lockstep_games
+        )
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser("PerfectDou quantized variant check")
+    parser.add_argument("--variant", type=str, default="int8")
+    parser.add_argument("--check_games", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--eval_data", type=str, default=None)
+    parser.add_argument("--num_workers", type=int, default=5)
+    parser.add_argument("--lockstep_games", type=int, default=0)
+    args = parser.parse_args()
+
+    report = check_variant(
+        args.variant,
+        args.check_games,
+        args.seed,
+        args.eval_data,
+        args.num_workers,
+        args.lockstep_games,
+    )
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
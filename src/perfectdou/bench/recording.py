@@ -0,0 +1,37 @@
+"""Infosets recorded from seeded random games, as benchmark inputs."""
+
+import copy
+import random
+
+from perfectdou.env.game import GameEnv
+from perfectdou.evaluation.random_agent import RandomAgent
+
+
+class _RecordingRandomAgent(RandomAgent):
+    def __init__(self, infosets):
+        super().__init__()
+        self.infosets = infosets
+
+    def act(self, infoset):
+        if len(infoset.legal_actions) > 1:
+            self.infosets.append(copy.deepcopy(infoset))
+        return super().act(infoset)
+
+
+def record_infosets(position, num_games, seed):
+    from perfectdou.cli.generate_eval_data import generate_block
+    from perfectdou.evaluation.deal_file import card_play_data_from_row
+
+    random.seed(seed)
+    infosets = []
+    players = {
+        pos: _RecordingRandomAgent(infosets) if pos == position else RandomAgent()
+        for pos in ["landlord", "landlord_up", "landlord_down"]
+    }
+    env = GameEnv(players)
+    for row in generate_block(seed, 0, num_games):
+        env.card_play_init(card_play_data_from_row(row))
+        while not env.game_over:
+            env.step()
+        env.reset()
+    return infosets
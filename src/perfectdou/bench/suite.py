@@ -0,0 +1,204 @@
+"""
+Reproducible benchmark suite behind the ``bench`` command.
+
+Every benchmark is seeded and reports plain numbers, and the whole run
+is emitted as one JSON document together with the machine, Python and
+git commit it ran on, so that runs can be compared across machines and
+commits.
+
+Micro benchmarks:
+    act           agent ``act`` latency per agent and position on
+                  infosets recorded from seeded random games
+    parse_cards   ``CardParser.parse_cards`` throughput on dealt hands
+    advisor       ``AIAdvisor.get_move_advice`` end-to-end latency
+Macro benchmarks:
+    games         games/s of one seat configuration on a seeded deal set
+"""
+
+import copy
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from perfectdou.bench.timing import percentile_summary, time_calls
+from perfectdou.hand import Hand
+
+POSITIONS = ["landlord", "landlord_up", "landlord_down"]
+MICRO = ["act", "parse_cards", "advisor"]
+MACRO = ["games"]
+# One of the input spellings parse_cards accepts, one token per card.
+HAND_LETTERS = dict(
+    zip([3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 17, 20, 30], "3456789TJQKA2BR")
+)
+
+
+def _seed(seed):
+    random.seed(seed)
+    np.random.seed(seed)
+
+
+def _deals(seed, num_games):
+    from perfectdou.cli.generate_eval_data import generate_block
+    from perfectdou.evaluation.deal_file import card_play_data_from_row
+
+    return [card_play_data_from_row(row) for row in generate_block(seed, 0, num_games)]
+
+
+def bench_act(agents, num_games, seed):
+    from perfectdou.bench.recording import record_infosets
+    from perfectdou.evaluation.simulation import load_agent
+
+    results = {}
+    for position in POSITIONS:
+        infosets = record_infosets(position, num_games, seed)
+        for spec in agents:
+            try:
+                agent = load_agent(position, spec)
+            except Exception as e:
+                results.setdefault(spec, {})[position] = {"error": str(e)}
+                continue
+            # Some agents rewrite the infoset they are given, so each one
+            # warms up and runs on its own copies.
+            for infoset in copy.deepcopy(infosets[:10]):
+                agent.act(infoset)
+            _seed(seed)
+            results.setdefault(spec, {})[position] = percentile_summary(
+                time_calls(agent.act, copy.deepcopy(infosets), warmup=0)
+            )
+    return results
+
+
+def bench_parse_cards(num_games, seed):
+    from perfectdou.battle_assistant.card_parser import CardParser
+
+    parser = CardParser()
+    hands = []
+    for deal in _deals(seed, num_games):
+        for position in POSITIONS:
+            hands.append(" ".join(HAND_LETTERS[card] for card in deal[position]))
+    latencies = time_calls(parser.parse_cards, hands)
+    summary = percentile_summary(latencies)
+    summary["parses_per_s"] = len(hands) / sum(latencies)
+    return summary
+
+
+def _advisor_states(num_games, seed):
+    """Opening positions for the landlord and for a farmer following a single."""
+    from perfectdou.battle_assistant.game_state import GameState, Position
+
+    states = []
+    for deal in _deals(seed, num_games):
+        three = deal["three_landlord_cards"]
+        landlord_hand = (Hand(deal["landlord"]) - three).cards()
+        state = GameState(Position.LANDLORD)
+        state.set_initial_cards(landlord_hand, three)
+        states.append(state)
+
+        state = GameState(Position.LANDLORD_UP)
+        state.set_initial_cards(deal["landlord_up"])
+        state.make_move(Position.LANDLORD, [min(deal["landlord"])])
+        states.append(state)
+    return states
+
+
+def bench_advisor(num_games, seed):
+    from perfectdou.battle_assistant.ai_advisor import AIAdvisor
+
+    # No cache here, or the warmup calls would make the timed calls hits.
+    advisor = AIAdvisor(cache_size=0)
+    states = _advisor_states(num_games, seed)
+    # Loading the agents is a one-off cost, not part of the latency.
+    start = time.perf_counter()
+    advisor._load_agents()
+    load_seconds = time.perf_counter() - start
+    _seed(seed)
+    summary = percentile_summary(time_calls(advisor.get_move_advice, states))
+    summary["load_seconds"] = load_seconds
+    # Repeated advice for the same situations, served by the cache.
+    advisor.cache_size = len(states)
+    for state in states:
+        advisor.get_move_advice(state)
+    summary["cache_hit"] = percentile_summary(
+        time_calls(advisor.get_move_advice, states, warmup=0)
+    )
+    return summary
+
+
+def bench_games(seats, num_games, seed, lockstep_games=0):
+    from perfectdou.evaluation.simulation import Table
+
+    table = Table(dict(zip(POSITIONS, seats)), lockstep_games)
+    deals = list(enumerate(_deals(seed, num_games)))
+    _seed(seed)
+    start = time.perf_counter()
+    results = table.play(deals)
+    seconds = time.perf_counter() - start
+    return {
+        "seats": dict(zip(POSITIONS, seats)),
+        "lockstep_games": lockstep_games,
+        "games": len(results),
+        "seconds": seconds,
+        "games_per_s": len(results) / seconds,
+        "mean_steps": float(np.mean([result.steps for result in results])),
+        "landlord_wp": float(np.mean([result.landlord_win for result in results])),
+    }
+
+
+def _git_commit():
+    try:
+        return (
+            subprocess.check_output(
+                ["git", "rev-parse", "HEAD"],
+                cwd=os.path.dirname(os.path.abspath(__file__)),
+                stderr=subprocess.DEVNULL,
+            )
+            .decode()
+            .strip()
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def metadata(seed):
+    return {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "git_commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "seed": seed,
+    }
+
+
+def run_suite(
+    benchmarks,
+    agents=("random", "rlcard", "perfectdou", "douzero"),
+    seats=("rlcard", "rlcard", "rlcard"),
+    num_games=20,
+    macro_games=200,
+    seed=0,
+    lockstep_games=0,
+):
+    """Run the named ``benchmarks`` and return the JSON-ready report."""
+    report = {"meta": metadata(seed), "results": {}}
+    for name in benchmarks:
+        _seed(seed)
+        if name == "act":
+            result = bench_act(agents, num_games, seed)
+        elif name == "parse_cards":
+            result = bench_parse_cards(num_games, seed)
+        elif name == "advisor":
+            result = bench_advisor(num_games, seed)
+        elif name == "games":
+            result = bench_games(seats, macro_games, seed, lockstep_games)
+        else:
+            raise ValueError("Unknown benchmark {}".format(name))
+        report["results"][name] = result
+    return report
@@ -0,0 +1,26 @@
+import time
+
+import numpy as np
+
+
+def percentile_summary(seconds):
+    """Summarize wall-clock samples (in seconds) as milliseconds."""
+    samples = np.asarray(seconds, dtype=np.float64) * 1000.0
+    return {
+        "count": int(samples.size),
+        "mean_ms": float(samples.mean()),
+        "p50_ms": float(np.percentile(samples, 50)),
+        "p99_ms": float(np.percentile(samples, 99)),
+    }
+
+
+def time_calls(fn, inputs, warmup=10):
+    """Call ``fn`` once per input and return the per-call latencies."""
+    for item in inputs[:warmup]:
+        fn(item)
+    latencies = []
+    for item in inputs:
+        start = time.perf_counter()
+        fn(item)
+        latencies.append(time.perf_counter() - start)
+    return latencies
@@ -0,0 +1,209 @@
+"""
+Compiled, memory-mapped form of ``card_type.json`` and ``specific_map.json``.
+
+Both tables map every legal move, spelled as a sorted rank string, to a
+short list: its ``[type, rank]`` entries and its abstract moves. Parsed
+with ``json`` that is about 55k Python objects per process. An index
+file stores the same content as flat arrays::
+
+    header (64 bytes)
+    keys              uint64[num_keys]      sorted ``perfectdou.cards`` keys
+    type_offsets      uint32[num_keys + 1]  entries of key i: offsets i to i+1
+    type_entries      uint8[num_types, 2]   (type name id, rank)
+    specific_offsets  uint32[num_keys + 1]
+    specific_entries  uint16[num_specific]  abstract move name ids
+    names             utf-8 JSON with the type and abstract move names
+
+Readers memory-map the arrays, so the pages are shared by every process
+on the machine and only the names are parsed. A move is found by binary
+search over ``keys``; "pass" has the empty key.
+"""
+
+import bisect
+import functools
+import json
+import mmap
+import os
+import struct
+from collections.abc import Mapping
+
+import numpy as np
+
+from perfectdou.cards import RANKS, key_counts, rank_key
+
+MAGIC = b"PDCARDS\x00"
+VERSION = 1
+HEADER_SIZE = 64
+DEFAULT_PATH = os.path.join(os.path.dirname(__file__), "data", "card_index.bin")
+
+_HEADER = struct.Struct("<8sHIIII")
+
+
+def _move_key(cards):
+    return 0 if cards == "pass" else rank_key(cards)
+
+
+def _key_cards(key):
+    if key == 0:
+        return "pass"
+    return "".join(rank * count for rank, count in zip(RANKS, key_counts(key)))
+
+
+def _aligned(size):
+    return (size + 7) // 8 * 8
+
+
+def _sections(num_keys, num_types, num_specific):
+    """(name, dtype, shape) of every array section, in file order."""
+    return (
+        ("keys", np.uint64, (num_keys,)),
+        ("type_offsets", np.uint32, (num_keys + 1,)),
+        ("type_entries", np.uint8, (num_types, 2)),
+        ("specific_offsets", np.uint32, (num_keys + 1,)),
+        ("specific_entries", np.uint16, (num_specific,)),
+    )
+
+
+def compile_card_index(card_type_path, specific_map_path, output_path):
+    """Compile the two JSON tables into an index file; returns the key count."""
+    with open(card_type_path) as f:
+        card_type = json.load(f)
+    with open(specific_map_path) as f:
+        specific_map = json.load(f)
+
+    keys = sorted(
+        {_move_key(cards) for cards in card_type}
+        | {_move_key(cards) for cards in specific_map}
+    )
+    type_ids = {}
+    specific_ids = {}
+    arrays = {
+        "keys": keys,
+        "type_offsets": [0],
+        "type_entries": [],
+        "specific_offsets": [0],
+        "specific_entries": [],
+    }
+    for key in keys:
+        cards = _key_cards(key)
+        for type_name, rank in card_type.get(cards, []):
+            if str(int(rank)) != rank:
+                raise ValueError("Unexpected rank {!r} for {}".format(rank, cards))
+            type_id = type_ids.setdefault(type_name, len(type_ids))
+            arrays["type_entries"].append((type_id, int(rank)))
+        arrays["type_offsets"].append(len(arrays["type_entries"]))
+        for abstract in specific_map.get(cards, []):
+            arrays["specific_entries"].append(
+                specific_ids.setdefault(abstract, len(specific_ids))
+            )
+        arrays["specific_offsets"].append(len(arrays["specific_entries"]))
+
+    names = json.dumps(
+        {"types": list(type_ids), "specific": list(specific_ids)}
+    ).encode()
+    num_types = len(arrays["type_entries"])
+    num_specific = len(arrays["specific_entries"])
+    header = _HEADER.pack(
+        MAGIC, VERSION, len(keys), num_types, num_specific, len(names)
+    )
+    with open(output_path, "wb") as f:
+        f.write(header.ljust(HEADER_SIZE, b"\x00"))
+        for name, dtype, shape in _sections(len(keys), num_types, num_specific):
+            data = np.asarray(arrays[name], dtype=dtype).reshape(shape).tobytes()
+            f.write(data.ljust(_aligned(len(data)), b"\x00"))
+        f.write(names)
+    return len(keys)
+
+
+class _Table(Mapping):
+    """Read-only ``dict`` view of one JSON table, keyed by rank string."""
+
+    def __init__(self, index, offsets, decode):
+        self._index = index
+        self._offsets = offsets
+        self._decode = decode
+        offsets = np.asarray(offsets)
+        self._rows = np.flatnonzero(offsets[1:] != offsets[:-1]).tolist()
+
+    def __getitem__(self, cards):
+        try:
+            row = self._index.find(_move_key(cards))
+        except KeyError:
+            row = -1
+        if row < 0 or self._offsets[row] == self._offsets[row + 1]:
+            raise KeyError(cards)
+        return self._decode(self._offsets[row], self._offsets[row + 1])
+
+    def __iter__(self):
+        keys = self._index.keys
+        for row in self._rows:
+            yield _key_cards(int(keys[row]))
+
+    def __len__(self):
+        return len(self._rows)
+
+
+class CardIndex:
+    """Read-only, memory-mapped view of an index file."""
+
+    def __init__(self, path=DEFAULT_PATH):
+        with open(path, "rb") as f:
+            raw = f.read(HEADER_SIZE)
+        if len(raw) < _HEADER.size or raw[: len(MAGIC)] != MAGIC:
+            raise ValueError("{} is not a card index".format(path))
+        version, num_keys, num_types, num_specific, names_size = _HEADER.unpack(
+            raw[: _HEADER.size]
+        )[1:]
+        if version != VERSION:
+            raise ValueError(
+                "{} has card index version {}, expected {}".format(
+                    path, version, VERSION
+                )
+            )
+        self.path = path
+        with open(path, "rb") as f:
+            # Plain arrays over the map: np.memmap slicing is far slower.
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        # Arrays for bulk use, and flat memoryviews of the same pages for
+        # single lookups, which are much cheaper than numpy scalars.
+        self._views = {}
+        offset = HEADER_SIZE
+        for name, dtype, shape in _sections(num_keys, num_types, num_specific):
+            count = int(np.prod(shape))
+            array = np.frombuffer(self._map, dtype=dtype, count=count, offset=offset)
+            setattr(self, name, array.reshape(shape))
+            view = memoryview(self._map)[offset : offset + array.nbytes]
+            self._views[name] = view.cast(array.dtype.char)
+            offset += _aligned(array.nbytes)
+        names = json.loads(self._map[offset : offset + names_size].decode())
+        self.type_names = names["types"]
+        self.specific_names = names["specific"]
+        self.card_type = _Table(self, self._views["type_offsets"], self._type_entries)
+        self.specific_map = _Table(
+            self, self._views["specific_offsets"], self._specific_entries
+        )
+
+    def find(self, key):
+        """Row of action key ``key``, or -1 when the tables do not list it."""
+        keys = self._views["keys"]
+        row = bisect.bisect_left(keys, key)
+        if row < len(keys) and keys[row] == key:
+            return row
+        return -1
+
+    def _type_entries(self, start, stop):
+        entries = self._views["type_entries"]
+        return [
+            [self.type_names[entries[2 * i]], str(entries[2 * i + 1])]
+            for i in range(start, stop)
+        ]
+
+    def _specific_entries(self, start, stop):
+        entries = self._views["specific_entries"]
+        return [self.specific_names[entries[i]] for i in range(start, stop)]
+
+
+@functools.lru_cache(maxsize=None)
+def load_card_index(path=DEFAULT_PATH):
+    """The process-wide ``CardIndex`` of ``path``."""
+    return CardIndex(path)
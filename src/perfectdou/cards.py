@@ -0,0 +1,61 @@
+"""
+Card ranks and count-vector keys shared by the agents and the assistant.
+
+A hand or a move is a multiset over the 15 ranks, so it is stored as a
+count per rank ("slot") rather than as a list of cards. Packing the 15
+counts into 3 bits each gives a canonical integer key: every ordering
+of the same cards has the same key, and keys can be added like the
+multisets they stand for.
+"""
+
+# RLCard's one-letter ranks and the env's card values, by slot.
+RANKS = "3456789TJQKA2BR"
+ENV_CARDS = (3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 17, 20, 30)
+NUM_SLOTS = len(RANKS)
+# The 2 and both jokers never extend a chain.
+NUM_CHAIN_SLOTS = 12
+
+ENV_SLOT = {card: slot for slot, card in enumerate(ENV_CARDS)}
+RANK_SLOT = {rank: slot for slot, rank in enumerate(RANKS)}
+ENV_TO_RANK = dict(zip(ENV_CARDS, RANKS))
+RANK_TO_ENV = dict(zip(RANKS, ENV_CARDS))
+
+KEY_BITS = 3
+_SLOT_MASK = (1 << KEY_BITS) - 1
+_ENV_UNIT = {card: 1 << (KEY_BITS * slot) for card, slot in ENV_SLOT.items()}
+_RANK_UNIT = {rank: 1 << (KEY_BITS * slot) for rank, slot in RANK_SLOT.items()}
+
+
+def env_key(cards):
+    """Key of a list of env card values, e.g. ``[3, 3, 17]``."""
+    key = 0
+    for card in cards:
+        key += _ENV_UNIT[card]
+    return key
+
+
+def rank_key(cards):
+    """Key of an RLCard rank string, e.g. ``"332"``."""
+    key = 0
+    for rank in cards:
+        key += _RANK_UNIT[rank]
+    return key
+
+
+def key_counts(key):
+    """The 15 per-slot counts packed in ``key``."""
+    return [(key >> (KEY_BITS * slot)) & _SLOT_MASK for slot in range(NUM_SLOTS)]
+
+
+def key_env_cards(key):
+    """Sorted env card values of a key; the inverse of ``env_key``."""
+    return [
+        card for card, count in zip(ENV_CARDS, key_counts(key)) for _ in range(count)
+    ]
+
+
+def counts_key(counts):
+    key = 0
+    for slot, count in enumerate(counts):
+        key |= count << (KEY_BITS * slot)
+    return key
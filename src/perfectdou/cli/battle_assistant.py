@@ -15,14 +15,24 @@ PerfectDou 斗地主实战助手
 - 用户友好的交互界面
 """
 
-from perfectdou.battle_assistant import BattleInterface
+import argparse
 
 
 def main():
     """主函数"""
+    parser = argparse.ArgumentParser(
+                    'PerfectDou 斗地主实战助手',
+                    description='交互式地为斗地主实战提供 AI 出牌建议')
+    parser.add_argument('--no_prefetch', action='store_true',
+                        help='不在对手回合后台预取 AI 建议')
+    args = parser.parse_args()
+
+    # 解析参数之后再导入，--help 不必加载交互界面
+    from perfectdou.battle_assistant import BattleInterface
+
     try:
         # 创建并启动实战界面
-        interface = BattleInterface()
+        interface = BattleInterface(prefetch=not args.no_prefetch)
         interface.start_battle()
     except KeyboardInterrupt:
         print("\n\n👋 感谢使用PerfectDou实战助手！")
@@ -0,0 +1,62 @@
+import os
+import sys
+import json
+import argparse
+import contextlib
+
+from perfectdou.bench.suite import MACRO, MICRO, run_suite
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(
+                    'PerfectDou Benchmarks')
+    parser.add_argument('--suite', type=str, default='all',
+            choices=['micro', 'macro', 'all'])
+    parser.add_argument('--only', type=str, nargs='+', default=None,
+            choices=MICRO + MACRO,
+            help='Run just these benchmarks instead of a suite')
+    parser.add_argument('--agents', type=str, nargs='+',
+            default=['random', 'rlcard', 'perfectdou', 'douzero'],
+            help='Agents whose act latency is measured')
+    parser.add_argument('--seats', type=str, nargs=3,
+            default=['rlcard', 'rlcard', 'rlcard'],
+            metavar=('LANDLORD', 'LANDLORD_UP', 'LANDLORD_DOWN'),
+            help='Seat configuration of the games/s benchmark')
+    parser.add_argument('--num_games', type=int, default=20,
+            help='Seeded games that the micro benchmarks draw inputs from')
+    parser.add_argument('--macro_games', type=int, default=200)
+    parser.add_argument('--lockstep_games', type=int, default=0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', type=str, default=None,
+            help='Also write the JSON report to this file')
+    args = parser.parse_args()
+
+    os.environ['KMP_DUPLICATE_LIB_OK'] = 'True'
+
+    if args.only:
+        benchmarks = args.only
+    elif args.suite == 'micro':
+        benchmarks = MICRO
+    elif args.suite == 'macro':
+        benchmarks = MACRO
+    else:
+        benchmarks = MICRO + MACRO
+
+    # Keep stdout for the report; agents and the advisor print warnings.
+    with contextlib.redirect_stdout(sys.stderr):
+        report = run_suite(benchmarks,
+                           agents=args.agents,
+                           seats=args.seats,
+                           num_games=args.num_games,
+                           macro_games=args.macro_games,
+                           seed=args.seed,
+                           lockstep_games=args.lockstep_games)
+    print(json.dumps(report, indent=2))
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
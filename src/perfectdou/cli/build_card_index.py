@@ -0,0 +1,28 @@
+import argparse
+
+from perfectdou import action_tables, card_index
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(
+                    'PerfectDou: compile the card type index and action tables')
+    parser.add_argument('--card_type', type=str, default='card_type.json')
+    parser.add_argument('--specific_map', type=str, default='specific_map.json')
+    parser.add_argument('--output', type=str, default=card_index.DEFAULT_PATH)
+    parser.add_argument('--action_space', type=str, default='action_space.json')
+    parser.add_argument('--action_values', type=str, default='action_values.json')
+    parser.add_argument('--action_output', type=str,
+            default=action_tables.DEFAULT_PATH)
+    args = parser.parse_args()
+
+    num_keys = card_index.compile_card_index(
+        args.card_type, args.specific_map, args.output)
+    print("compiled {} moves -> {}".format(num_keys, args.output))
+    num_actions = action_tables.compile_action_tables(
+        args.action_space, args.action_values, args.action_output)
+    print("compiled {} actions -> {}".format(num_actions, args.action_output))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,9 @@
 import os
 import argparse
 
-from perfectdou.evaluation.simulation import evaluate
+from perfectdou.evaluation.resources import plan_resources
+from perfectdou.evaluation.simulation import autotune, evaluate
+from perfectdou.evaluation.stats import SPRT, EarlyStop
 
 
 def main():
@@ -15,19 +17,107 @@ def main():
     parser.add_argument('--landlord_down', type=str,
             default='baselines/sl/landlord_down.ckpt')
     parser.add_argument('--eval_data', type=str,
-            default='eval_data.pkl')
-    parser.add_argument('--num_workers', type=int, default=5)
+            default='eval_data.deals',
+            help='Deal file from generate-eval (legacy pickles are '
+                 'converted on the fly)')
+    parser.add_argument('--num_workers', type=int, default=None,
+            help='Worker processes (default 5, or derived from '
+                 '--cpu_budget)')
     parser.add_argument('--gpu_device', type=str, default='')
+    parser.add_argument('--lockstep_games', type=int, default=0,
+            help='Games each worker advances together so that model '
+                 'calls are batched across them (0: play one by one)')
+    parser.add_argument('--chunk_size', type=int, default=100,
+            help='Deals handed to a worker per request; idle workers '
+                 'keep pulling chunks until the deal set is exhausted')
+    parser.add_argument('--confidence', type=float, default=0.95,
+            help='Confidence level of the reported WP/ADP intervals')
+    parser.add_argument('--wp_margin', type=float, default=None,
+            help='Stop once the landlord WP interval half-width is '
+                 'at most this value')
+    parser.add_argument('--adp_margin', type=float, default=None,
+            help='Stop once the landlord ADP interval half-width is '
+                 'at most this value')
+    parser.add_argument('--sprt', type=float, nargs=2, default=None,
+            metavar=('P0', 'P1'),
+            help='Stop once an SPRT of landlord WP p0 against p1 decides')
+    parser.add_argument('--alpha', type=float, default=0.05)
+    parser.add_argument('--beta', type=float, default=0.05)
+    parser.add_argument('--min_games', type=int, default=200,
+            help='Games played before any stopping rule is checked')
+    parser.add_argument('--duplicate', action='store_true',
+            help='Replay every deal with --landlord_up as landlord and '
+                 '--landlord as both farmers, and report paired deltas; '
+                 '--landlord_up and --landlord_down must be the same agent')
+    parser.add_argument('--log_dir', type=str, default=None,
+            help='Directory for per-game logs and periodic checkpoints')
+    parser.add_argument('--resume', action='store_true',
+            help='Continue the run in --log_dir, skipping finished deals')
+    parser.add_argument('--checkpoint_interval', type=float, default=60.0,
+            help='Seconds between checkpoints written to --log_dir')
+    parser.add_argument('--cpu_budget', type=int, default=None,
+            help='Cores to split between workers and model threads; '
+                 'each worker is pinned to its own cores')
+    parser.add_argument('--intra_op_threads', type=int, default=None,
+            help='Inference threads per worker')
+    parser.add_argument('--autotune', action='store_true',
+            help='Try each workers x threads split of --cpu_budget on '
+                 'a few deals first and evaluate with the fastest')
+    parser.add_argument('--autotune_deals', type=int, default=200)
+    parser.add_argument('--profile', action='store_true',
+            help='Time encoding, inference, decoding and GameEnv.step '
+                 'per agent and position, and print the merged report')
     args = parser.parse_args()
+    if args.duplicate and args.landlord_up != args.landlord_down:
+        parser.error('--duplicate needs the same agent for --landlord_up '
+                     'and --landlord_down')
+    if args.autotune and args.num_workers is not None:
+        parser.error('--autotune picks the number of workers; '
+                     'drop --num_workers or --autotune')
 
     os.environ['KMP_DUPLICATE_LIB_OK'] = 'True'
     os.environ["CUDA_VISIBLE_DEVICES"] = args.gpu_device
 
+    early_stop = None
+    if args.wp_margin is not None or args.adp_margin is not None or args.sprt:
+        early_stop = EarlyStop(
+            wp_margin=args.wp_margin,
+            adp_margin=args.adp_margin,
+            sprt=SPRT(*args.sprt, alpha=args.alpha, beta=args.beta)
+                 if args.sprt else None,
+            confidence=args.confidence,
+            min_games=args.min_games)
+
+    plan = None
+    if args.autotune:
+        plan = autotune({'landlord': args.landlord,
+                         'landlord_up': args.landlord_up,
+                         'landlord_down': args.landlord_down},
+                        args.eval_data,
+                        cpu_budget=args.cpu_budget,
+                        num_deals=args.autotune_deals,
+                        lockstep_games=args.lockstep_games)
+        print("Autotune picked {}".format(plan.describe()))
+    elif args.cpu_budget is not None or args.intra_op_threads is not None:
+        plan = plan_resources(args.cpu_budget,
+                              args.num_workers,
+                              args.intra_op_threads)
+
     evaluate(args.landlord,
              args.landlord_up,
              args.landlord_down,
              args.eval_data,
-             args.num_workers)
+             args.num_workers or 5,
+             lockstep_games=args.lockstep_games,
+             chunk_size=args.chunk_size,
+             confidence=args.confidence,
+             early_stop=early_stop,
+             duplicate=args.duplicate,
+             log_dir=args.log_dir,
+             resume=args.resume,
+             checkpoint_interval=args.checkpoint_interval,
+             plan=plan,
+             profile=args.profile)
 
 
 if __name__ == '__main__':
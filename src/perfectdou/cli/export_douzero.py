@@ -0,0 +1,60 @@
+import os
+import sys
+import argparse
+
+from perfectdou.bench.deep_agent import record_observations
+from perfectdou.evaluation.deep_agent import _load_model
+from perfectdou.evaluation.douzero_onnx_agent import _load_model as _load_session
+from perfectdou.model.douzero.export import export_onnx, parity_check
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(
+                    'Export DouZero checkpoints to ONNX')
+    parser.add_argument('--checkpoint', type=str,
+            default='baselines/douzero_ADP',
+            help='Directory holding {position}.ckpt, or a single '
+                 'checkpoint together with one --positions entry')
+    parser.add_argument('--output_dir', type=str,
+            default='baselines/douzero_ADP')
+    parser.add_argument('--positions', type=str, nargs='+',
+            default=['landlord', 'landlord_up', 'landlord_down'])
+    parser.add_argument('--check_games', type=int, default=20,
+            help='Random games whose observations are used to compare '
+                 'the ONNX graph with the torch model (0: skip)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--tolerance', type=float, default=1e-4)
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.checkpoint) and len(args.positions) != 1:
+        parser.error('a single checkpoint file needs exactly one position')
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    failed = False
+    for position in args.positions:
+        checkpoint = args.checkpoint
+        if os.path.isdir(checkpoint):
+            checkpoint = os.path.join(checkpoint, '{}.ckpt'.format(position))
+        output = os.path.join(args.output_dir, '{}.onnx'.format(position))
+        model = _load_model(position, checkpoint)
+        export_onnx(model, output)
+        print('Exported {} to {}'.format(checkpoint, output))
+
+        if args.check_games > 0:
+            observations = record_observations(
+                position, args.check_games, args.seed)
+            max_abs_diff = parity_check(
+                model, _load_session(output), observations)
+            print('  parity over {} decisions: max abs diff {:.3g}'.format(
+                len(observations), max_abs_diff))
+            failed = failed or max_abs_diff > args.tolerance
+
+    if failed:
+        print('ONNX outputs differ from torch by more than {}'.format(
+            args.tolerance))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,52 +1,94 @@
 import argparse
+import multiprocessing as mp
 import pickle
 import numpy as np
 
-deck = []
-for i in range(3, 15):
-    deck.extend([i for _ in range(4)])
-deck.extend([17 for _ in range(4)])
-deck.extend([20, 30])
+from perfectdou.evaluation.deal_file import (
+    DealWriter,
+    card_play_data_from_row,
+    convert_pickle,
+    sort_segments,
+)
+
+DECK = np.array([i for i in range(3, 15) for _ in range(4)]
+                + [17] * 4 + [20, 30], dtype=np.uint8)
+
+# Deals are produced in fixed-size blocks, each from its own child seed,
+# so deal k only depends on (seed, k) and not on --num_procs.
+BLOCK_SIZE = 65536
 
 def get_parser():
     parser = argparse.ArgumentParser(description='DouZero: random data generator')
     parser.add_argument('--output', default='eval_data', type=str)
     parser.add_argument('--num_games', default=10000, type=int)
+    parser.add_argument('--seed', default=None, type=int,
+                        help='Seed for reproducible deals (random if omitted)')
+    parser.add_argument('--num_procs', default=1, type=int,
+                        help='Processes used to generate blocks of deals')
+    parser.add_argument('--format', default='deals', choices=['deals', 'pkl'],
+                        help='deals: compact memory-mapped file, pkl: legacy pickle')
+    parser.add_argument('--convert', default=None, type=str,
+                        help='Convert an existing pickle to a deal file '
+                             'instead of generating new deals')
     return parser
     
-def generate():
-    _deck = deck.copy()
-    np.random.shuffle(_deck)
-    card_play_data = {'landlord': _deck[:20],
-                      'landlord_up': _deck[20:37],
-                      'landlord_down': _deck[37:54],
-                      'three_landlord_cards': _deck[17:20],
-                      }
-    for key in card_play_data:
-        card_play_data[key].sort()
-    return card_play_data
+def generate_block(seed, block_index, num_games=BLOCK_SIZE):
+    """Deal rows ``block_index * BLOCK_SIZE`` onwards, in deal file layout."""
+    rng = np.random.default_rng(
+        np.random.SeedSequence(seed, spawn_key=(block_index,)))
+    rows = np.tile(DECK, (BLOCK_SIZE, 1))
+    rng.permuted(rows, axis=1, out=rows)
+    return sort_segments(rows[:num_games])
+
+
+def _generate_task(task):
+    return generate_block(*task)
+
+
+def generate_blocks(num_games, seed, num_procs=1):
+    """Yield blocks of deal rows in order, generated by ``num_procs`` workers."""
+    tasks = [(seed, block_index, min(BLOCK_SIZE, num_games - start))
+             for block_index, start in enumerate(range(0, num_games, BLOCK_SIZE))]
+    if num_procs <= 1:
+        for task in tasks:
+            yield _generate_task(task)
+        return
+    with mp.get_context("spawn").Pool(num_procs) as pool:
+        for rows in pool.imap(_generate_task, tasks):
+            yield rows
 
 
 def main():
     """主函数"""
     flags = get_parser().parse_args()
-    output_pickle = flags.output + '.pkl'
 
-    print("output_pickle:", output_pickle)
-    print("generating data...")
+    if flags.convert:
+        output_deals = flags.output + '.deals'
+        print("converting {} -> {}".format(flags.convert, output_deals))
+        num_deals = convert_pickle(flags.convert, output_deals)
+        print("converted {} deals".format(num_deals))
+        return
 
-    data = []
-    for _ in range(flags.num_games):
-        data.append(generate())
+    seed = flags.seed
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+    print("seed:", seed)
+    print("generating data...")
+    blocks = generate_blocks(flags.num_games, seed, flags.num_procs)
 
-    print("saving pickle file...")
-    with open(output_pickle,'wb') as g:
-        pickle.dump(data,g,pickle.HIGHEST_PROTOCOL)
+    if flags.format == 'pkl':
+        output_pickle = flags.output + '.pkl'
+        data = [card_play_data_from_row(row) for rows in blocks for row in rows]
+        print("saving pickle file:", output_pickle)
+        with open(output_pickle,'wb') as g:
+            pickle.dump(data,g,pickle.HIGHEST_PROTOCOL)
+    else:
+        output_deals = flags.output + '.deals'
+        print("saving deal file:", output_deals)
+        with DealWriter(output_deals) as writer:
+            for rows in blocks:
+                writer.write(rows)
 
 
 if __name__ == '__main__':
     main()
-
-
-
-
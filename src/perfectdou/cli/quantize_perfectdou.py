@@ -0,0 +1,54 @@
+import sys
+import json
+import argparse
+
+from perfectdou.bench.quantization import POSITIONS, check_variant
+from perfectdou.evaluation.perfectdou_agent import model_path
+from perfectdou.model.quantize import quantize_model
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(
+                    'Quantize the PerfectDou models to INT8')
+    parser.add_argument('--per_channel', action='store_true',
+            help='One quantization scale per output channel')
+    parser.add_argument('--check_games', type=int, default=20,
+            help='Self-play games whose decisions are replayed through '
+                 'both models (0: skip the check)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--eval_data', type=str, default=None,
+            help='Also report the WP/ADP change on this deal file')
+    parser.add_argument('--num_workers', type=int, default=5)
+    parser.add_argument('--min_agreement', type=float, default=0.99,
+            help='Exit with an error when fewer decisions agree')
+    parser.add_argument('--report', type=str, default=None,
+            help='Where to write the check report (JSON)')
+    args = parser.parse_args()
+
+    for position in POSITIONS:
+        fp32_size, int8_size = quantize_model(
+            model_path(position), model_path(position, 'int8'),
+            per_channel=args.per_channel)
+        print('Quantized {}: {:.1f} MB -> {:.1f} MB'.format(
+            position, fp32_size / 2 ** 20, int8_size / 2 ** 20))
+
+    if args.check_games <= 0:
+        return
+    report = check_variant('int8',
+                           args.check_games,
+                           args.seed,
+                           args.eval_data,
+                           args.num_workers)
+    print(json.dumps(report, indent=2))
+    if args.report is not None:
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=2)
+    if report['agreement'] < args.min_agreement:
+        print('Decision agreement {:.4f} is below {}'.format(
+            report['agreement'], args.min_agreement))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+import os
+import argparse
+
+from perfectdou.evaluation.tournament import print_matrix, tournament
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(
+                    'Dou Dizhu Round-robin Tournament')
+    parser.add_argument('--agents', type=str, nargs='+', required=True,
+            help='Agents to compare: random, rlcard, douzero, douzero_onnx, '
+                 'perfectdou or checkpoint paths')
+    parser.add_argument('--eval_data', type=str,
+            default='eval_data.deals')
+    parser.add_argument('--num_workers', type=int, default=5)
+    parser.add_argument('--lockstep_games', type=int, default=0)
+    parser.add_argument('--chunk_size', type=int, default=100)
+    parser.add_argument('--confidence', type=float, default=0.95)
+    parser.add_argument('--output', type=str, default='tournament.json',
+            help='Where to write the results matrix (JSON)')
+    parser.add_argument('--gpu_device', type=str, default='')
+    args = parser.parse_args()
+
+    os.environ['KMP_DUPLICATE_LIB_OK'] = 'True'
+    os.environ["CUDA_VISIBLE_DEVICES"] = args.gpu_device
+
+    matrix = tournament(args.agents,
+                        args.eval_data,
+                        args.num_workers,
+                        output=args.output,
+                        lockstep_games=args.lockstep_games,
+                        chunk_size=args.chunk_size,
+                        confidence=args.confidence)
+    print_matrix(matrix)
+    print("Results matrix written to {}".format(args.output))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+"""
+RLCard's move-type table keyed by count-vector action keys.
+
+RLCard's ``CARD_TYPE`` maps every move, spelled as a sorted rank string,
+to its (type, rank). Here the same table is keyed by
+``perfectdou.cards`` integer keys, so a move given as env card values
+is looked up without building a string, and types are small integer
+ids. The table is built once per process from the compiled card index
+rather than from ``card_type.json``.
+"""
+
+import functools
+from collections import namedtuple
+
+import numpy as np
+
+from perfectdou.card_index import load_card_index
+
+CardTypeTable = namedtuple("CardTypeTable", ["type_names", "types"])
+
+
+@functools.lru_cache(maxsize=None)
+def card_type_table():
+    """
+    ``types`` maps an action key to ``(type id, rank)`` using the first
+    entry RLCard lists for the move; ``type_names[type id]`` names it.
+    """
+    index = load_card_index()
+    offsets = index.type_offsets
+    rows = np.flatnonzero(offsets[1:] != offsets[:-1])
+    firsts = index.type_entries[offsets[rows]].astype(np.int64)
+    # Share one tuple per distinct (type, rank).
+    packed, inverse = np.unique(firsts[:, 0] << 8 | firsts[:, 1], return_inverse=True)
+    pairs = [(value >> 8, value & 0xFF) for value in packed.tolist()]
+    types = dict(
+        zip(index.keys[rows].tolist(), map(pairs.__getitem__, inverse.tolist()))
+    )
+    return CardTypeTable(tuple(index.type_names), types)
@@ -0,0 +1,202 @@
+"""
+Compact on-disk format for evaluation deals.
+
+A deal file is a fixed 64-byte header followed by one ``uint8`` row of
+card codes per deal. A row is the dealt deck in seat order::
+
+    [ landlord (17) | three landlord cards (3) | landlord_up (17) | landlord_down (17) ]
+
+with every segment sorted, so the landlord's 20-card hand is the first
+20 bytes. The header stores the magic, format version, row width, deal
+count and the segment table above, which lets readers find any deal with
+a single offset computation. Readers memory-map the rows, so a worker only
+touches the pages of the deals it actually plays.
+"""
+
+import contextlib
+import os
+import pickle
+import struct
+import tempfile
+
+import numpy as np
+
+from perfectdou.hand import Hand
+
+MAGIC = b"PDDEALS\x00"
+VERSION = 1
+HEADER_SIZE = 64
+ROW_WIDTH = 54
+
+# (name, start, stop) of every segment stored in the header.
+SEGMENTS = (
+    ("landlord", 0, 20),
+    ("three_landlord_cards", 17, 20),
+    ("landlord_up", 20, 37),
+    ("landlord_down", 37, 54),
+)
+
+# The ranges kept sorted within a row; the landlord's hand spans two.
+SORTED_RANGES = ((0, 17), (17, 20), (20, 37), (37, 54))
+
+_HEADER = struct.Struct("<8sHHQB" + "BB" * len(SEGMENTS))
+
+
+def _pack_header(num_deals):
+    fields = [MAGIC, VERSION, ROW_WIDTH, num_deals, len(SEGMENTS)]
+    for _, start, stop in SEGMENTS:
+        fields.extend([start, stop])
+    return _HEADER.pack(*fields).ljust(HEADER_SIZE, b"\x00")
+
+
+def read_header(path):
+    with open(path, "rb") as f:
+        raw = f.read(HEADER_SIZE)
+    if len(raw) < _HEADER.size or raw[: len(MAGIC)] != MAGIC:
+        raise ValueError("{} is not a deal file".format(path))
+    fields = _HEADER.unpack(raw[: _HEADER.size])
+    version, row_width, num_deals = fields[1:4]
+    if version != VERSION:
+        raise ValueError(
+            "{} has deal file version {}, expected {}".format(path, version, VERSION)
+        )
+    segments = fields[5:]
+    layout = {
+        name: (segments[2 * i], segments[2 * i + 1])
+        for i, (name, _, _) in enumerate(SEGMENTS)
+    }
+    return {"row_width": row_width, "num_deals": num_deals, "segments": layout}
+
+
+def is_deal_file(path):
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def row_from_card_play_data(card_play_data):
+    """Inverse of ``DealFile.__getitem__`` for a legacy deal dict."""
+    landlord_only = Hand(card_play_data["landlord"]) - card_play_data[
+        "three_landlord_cards"
+    ]
+    row = (
+        landlord_only.cards()
+        + sorted(card_play_data["three_landlord_cards"])
+        + sorted(card_play_data["landlord_up"])
+        + sorted(card_play_data["landlord_down"])
+    )
+    if len(row) != ROW_WIDTH:
+        raise ValueError(
+            "A deal must hold {} cards, got {}".format(ROW_WIDTH, len(row))
+        )
+    return np.asarray(row, dtype=np.uint8)
+
+
+def card_play_data_from_row(row, segments=None):
+    """Build the ``GameEnv.card_play_init`` dict for one stored row."""
+    if segments is None:
+        segments = {name: (start, stop) for name, start, stop in SEGMENTS}
+    row = row.tolist()
+    card_play_data = {name: row[start:stop] for name, (start, stop) in segments.items()}
+    card_play_data["landlord"].sort()
+    return card_play_data
+
+
+def sort_segments(rows):
+    """Sort the four dealt segments of a block of decks in place."""
+    for start, stop in SORTED_RANGES:
+        rows[:, start:stop].sort(axis=1)
+    return rows
+
+
+class DealWriter:
+    """Appends blocks of rows and fixes up the deal count on close."""
+
+    def __init__(self, path):
+        self.path = path
+        self.num_deals = 0
+        self._file = open(path, "wb")
+        self._file.write(_pack_header(0))
+
+    def write(self, rows):
+        rows = np.ascontiguousarray(rows, dtype=np.uint8)
+        if rows.ndim != 2 or rows.shape[1] != ROW_WIDTH:
+            raise ValueError("Expected rows of shape (n, {})".format(ROW_WIDTH))
+        self._file.write(rows.tobytes())
+        self.num_deals += rows.shape[0]
+
+    def close(self):
+        if self._file.closed:
+            return
+        self._file.seek(0)
+        self._file.write(_pack_header(self.num_deals))
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class DealFile:
+    """Read-only, memory-mapped view of a deal file."""
+
+    def __init__(self, path):
+        header = read_header(path)
+        self.path = path
+        self.segments = header["segments"]
+        shape = (header["num_deals"], header["row_width"])
+        if header["num_deals"] == 0:
+            # An empty region cannot be memory-mapped.
+            self.rows = np.zeros(shape, dtype=np.uint8)
+        else:
+            self.rows = np.memmap(
+                path, dtype=np.uint8, mode="r", offset=HEADER_SIZE, shape=shape
+            )
+
+    def __len__(self):
+        return self.rows.shape[0]
+
+    def __getitem__(self, index):
+        return card_play_data_from_row(self.rows[index], self.segments)
+
+    def read(self, start, stop):
+        return [self[index] for index in range(start, min(stop, len(self)))]
+
+    def take(self, indices):
+        return [self[index] for index in indices]
+
+
+def convert_pickle(pickle_path, output_path):
+    """Convert a legacy pickled list of deal dicts into a deal file."""
+    with open(pickle_path, "rb") as f:
+        card_play_data_list = pickle.load(f)
+    with DealWriter(output_path) as writer:
+        block = []
+        for card_play_data in card_play_data_list:
+            block.append(row_from_card_play_data(card_play_data))
+            if len(block) == 65536:
+                writer.write(np.stack(block))
+                block = []
+        if block:
+            writer.write(np.stack(block))
+    return len(card_play_data_list)
+
+
+@contextlib.contextmanager
+def as_deal_file(eval_data):
+    """
+    Yield a deal file path for ``eval_data``. A legacy pickle is converted
+    to a temporary deal file, removed again on exit, so that workers can
+    always share a memory map.
+    """
+    if is_deal_file(eval_data):
+        yield eval_data
+        return
+    fd, converted = tempfile.mkstemp(suffix=".deals")
+    os.close(fd)
+    try:
+        convert_pickle(eval_data, converted)
+        yield converted
+    finally:
+        os.remove(converted)
@@ -22,20 +22,66 @@ def _load_model(position, model_path):
 
 
 class DeepAgent:
-    def __init__(self, position, model_path):
+    # Methods timed by evaluation.profiling when profiling is on.
+    PROFILE_PHASES = {"_encode": "encode", "_predict": "inference"}
+
+    def __init__(self, position, model_path, intra_op_threads=None):
+        if intra_op_threads is not None:
+            # Torch keeps a single intra-op pool per process.
+            torch.set_num_threads(intra_op_threads)
         self.model = _load_model(position, model_path)
 
+    def _encode(self, infoset):
+        return get_obs(infoset)
+
+    def _predict(self, z, x_batch, num_actions=None):
+        if torch.cuda.is_available():
+            z, x_batch = z.cuda(), x_batch.cuda()
+            if num_actions is not None:
+                num_actions = num_actions.cuda()
+        with torch.no_grad():
+            y_pred = self.model.predict(z, x_batch, num_actions)
+        return y_pred.cpu().numpy()
+
     def act(self, infoset):
         if len(infoset.legal_actions) == 1:
             return infoset.legal_actions[0]
-        obs = get_obs(infoset)
-        z_batch = torch.from_numpy(obs["z_batch"]).float()
+        obs = self._encode(infoset)
+        # The history is shared by every legal action, so encode it once.
+        z = torch.from_numpy(obs["z"][np.newaxis]).float()
         x_batch = torch.from_numpy(obs["x_batch"]).float()
-        if torch.cuda.is_available():
-            z_batch, x_batch = z_batch.cuda(), x_batch.cuda()
-        y_pred = self.model.forward(z_batch, x_batch, return_value=True)["values"]
-        y_pred = y_pred.detach().cpu().numpy()
+        y_pred = self._predict(z, x_batch)
 
         best_action_index = np.argmax(y_pred, axis=0)[0]
         best_action = infoset.legal_actions[best_action_index]
         return best_action
+
+    def act_batch(self, infosets):
+        """
+        Score the legal actions of many games in one forward pass. The
+        per-game action batches are concatenated and the argmax is taken
+        within each game's segment.
+        """
+        actions = [None] * len(infosets)
+        zs, x_batches, offsets, pending = [], [], [0], []
+        for i, infoset in enumerate(infosets):
+            if len(infoset.legal_actions) == 1:
+                actions[i] = infoset.legal_actions[0]
+                continue
+            obs = self._encode(infoset)
+            zs.append(obs["z"])
+            x_batches.append(obs["x_batch"])
+            offsets.append(offsets[-1] + len(infoset.legal_actions))
+            pending.append(i)
+        if not pending:
+            return actions
+
+        z = torch.from_numpy(np.stack(zs)).float()
+        x_batch = torch.from_numpy(np.concatenate(x_batches)).float()
+        num_actions = torch.from_numpy(np.diff(offsets))
+        y_pred = self._predict(z, x_batch, num_actions)[:, 0]
+
+        for k, i in enumerate(pending):
+            segment = y_pred[offsets[k] : offsets[k + 1]]
+            actions[i] = infosets[i].legal_actions[int(np.argmax(segment))]
+        return actions
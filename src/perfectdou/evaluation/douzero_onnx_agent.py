@@ -0,0 +1,74 @@
+import numpy as np
+import onnxruntime as ort
+from perfectdou.env.env import get_obs
+
+
+def _load_model(model_path, intra_op_threads=1):
+    sess_options = ort.SessionOptions()
+    sess_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    sess_options.inter_op_num_threads = 1
+    sess_options.intra_op_num_threads = intra_op_threads
+    sess_options.log_severity_level = 3
+    return ort.InferenceSession(model_path, sess_options)
+
+
+class DouZeroOnnxAgent:
+    """
+    DouZero baseline on onnxruntime, for graphs written by
+    ``perfectdou.model.douzero.export``. Plays like ``DeepAgent`` without
+    importing torch.
+    """
+
+    # Methods timed by evaluation.profiling when profiling is on.
+    PROFILE_PHASES = {"_encode": "encode", "_values": "inference"}
+
+    def __init__(self, position, model_path, intra_op_threads=1):
+        self.position = position
+        self.model = _load_model(model_path, intra_op_threads)
+
+    def _encode(self, infoset):
+        return get_obs(infoset)
+
+    def _values(self, zs, x_batches):
+        decision_index = np.repeat(
+            np.arange(len(x_batches), dtype=np.int64),
+            [len(x_batch) for x_batch in x_batches],
+        )
+        return self.model.run(
+            ["values"],
+            {
+                "z": np.stack(zs).astype(np.float32),
+                "x": np.concatenate(x_batches).astype(np.float32),
+                "decision_index": decision_index,
+            },
+        )[0][:, 0]
+
+    def act(self, infoset):
+        if len(infoset.legal_actions) == 1:
+            return infoset.legal_actions[0]
+        obs = self._encode(infoset)
+        values = self._values([obs["z"]], [obs["x_batch"]])
+        return infoset.legal_actions[int(np.argmax(values))]
+
+    def act_batch(self, infosets):
+        """Score the legal actions of many games in one ``run()`` call."""
+        actions = [None] * len(infosets)
+        zs, x_batches, pending = [], [], []
+        for i, infoset in enumerate(infosets):
+            if len(infoset.legal_actions) == 1:
+                actions[i] = infoset.legal_actions[0]
+                continue
+            obs = self._encode(infoset)
+            zs.append(obs["z"])
+            x_batches.append(obs["x_batch"])
+            pending.append(i)
+        if not pending:
+            return actions
+
+        values = self._values(zs, x_batches)
+        start = 0
+        for i, x_batch in zip(pending, x_batches):
+            segment = values[start : start + len(x_batch)]
+            actions[i] = infosets[i].legal_actions[int(np.argmax(segment))]
+            start += len(x_batch)
+        return actions
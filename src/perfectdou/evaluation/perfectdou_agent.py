@@ -9,16 +9,24 @@ from perfectdou.env.encode import (
 from perfectdou.env.game import bombs
 
 
-def _load_model(position):
+def model_path(position, variant=None):
+    """The bundled graph for ``position``, e.g. ``landlord.int8.onnx``."""
     model_dir = "{}/../model/perfectdou".format(os.path.dirname(__file__))
+    name = position if variant is None else "{}.{}".format(position, variant)
+    return "{}/{}.onnx".format(model_dir, name)
+
+
+def _load_model(position, intra_op_threads=1, variant=None):
     sess_options = ort.SessionOptions()
     sess_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
     sess_options.inter_op_num_threads = 1
-    sess_options.intra_op_num_threads = 1
+    sess_options.intra_op_num_threads = intra_op_threads
     sess_options.log_severity_level = 3
-    return ort.InferenceSession("{}/{}.onnx".format(model_dir, position), sess_options)
+    return ort.InferenceSession(model_path(position, variant), sess_options)
 
 
+ONNX_FLOAT_TYPES = {"tensor(float)": np.float32, "tensor(double)": np.float64}
+
 RLCard2EnvCard = {
     "3": 3,
     "4": 4,
@@ -39,26 +47,137 @@ RLCard2EnvCard = {
 
 
 class PerfectDouAgent:
-    def __init__(self, position):
-        self.model = _load_model(position)
+    # Methods timed by evaluation.profiling when profiling is on.
+    PROFILE_PHASES = {
+        "_encode_obs": "encode",
+        "_infer": "inference",
+        "_run_batch": "inference",
+        "_decode": "decode",
+    }
+
+    def __init__(self, position, intra_op_threads=1, variant=None):
+        self.model = _load_model(position, intra_op_threads, variant)
         self.position = position
         self.bomb_num = 0
         self.control = 0
         self.have_bomb = 0
+        model_input = self.model.get_inputs()[0]
+        self.input_name = model_input.name
+        self.input_dtype = ONNX_FLOAT_TYPES.get(model_input.type, np.float32)
+        self.output_name = "action_logit"
+        model_output = [
+            output
+            for output in self.model.get_outputs()
+            if output.name == self.output_name
+        ][0]
+        self.output_dtype = ONNX_FLOAT_TYPES.get(model_output.type, np.float32)
+        self.output_shape = [1] + list(model_output.shape[1:])
+        # A graph exported with a fixed batch of 1 cannot take stacked rows.
+        batch_dim = model_input.shape[0]
+        self.supports_batch = not isinstance(batch_dim, int) or batch_dim != 1
+        # Single-decision buffers, sized on the first call (see _bind).
+        self._input = None
+        self._logit = None
+        self._binding = None
 
-    def act(self, infoset):
+    def _encode_obs(self, infoset):
         if infoset.player_position == "landlord":
-            obs = encode_obs_landlord(infoset)
+            return encode_obs_landlord(infoset)
         elif infoset.player_position == "landlord_up":
-            obs = encode_obs_peasant(infoset)
+            return encode_obs_peasant(infoset)
         elif infoset.player_position == "landlord_down":
-            obs = encode_obs_peasant(infoset)
-        input_name = self.model.get_inputs()[0].name
-        input_data = np.concatenate(
-            [obs["x_no_action"].flatten(), obs["legal_actions_arr"].flatten()]
-        ).reshape(1, -1)
-        logit = self.model.run(["action_logit"], {input_name: input_data})
+            return encode_obs_peasant(infoset)
+
+    @staticmethod
+    def _input_size(obs):
+        return obs["x_no_action"].size + obs["legal_actions_arr"].size
+
+    @staticmethod
+    def _write_input(obs, row):
+        """Copy the encoded arrays into ``row`` without temporaries."""
+        split = obs["x_no_action"].size
+        row[:split] = obs["x_no_action"].reshape(-1)
+        row[split:] = obs["legal_actions_arr"].reshape(-1)
+
+    def _encode(self, infoset):
+        obs = self._encode_obs(infoset)
+        input_data = np.empty(self._input_size(obs), dtype=self.input_dtype)
+        self._write_input(obs, input_data)
+        return obs, input_data
+
+    def _decode(self, logit, obs):
         action_id = np.argmax(logit)
         action = _decode_action(action_id, obs["current_hand"], obs["actions"])
         action = [] if action == "pass" else [RLCard2EnvCard[e] for e in action]
         return action
+
+    def _bind(self, input_size):
+        """
+        Allocate the (1, input_size) input row and bind it, and the logit
+        output when its shape is known, to an IOBinding so that ``act``
+        runs on the same memory every time. Builds of onnxruntime without
+        pointer binding fall back to ``run()`` on the same input row.
+        """
+        self._input = np.zeros((1, input_size), dtype=self.input_dtype)
+        self._logit = None
+        self._binding = None
+        try:
+            binding = self.model.io_binding()
+            binding.bind_input(
+                self.input_name,
+                "cpu",
+                0,
+                self.input_dtype,
+                list(self._input.shape),
+                self._input.ctypes.data,
+            )
+            if all(isinstance(dim, int) for dim in self.output_shape):
+                logit = np.zeros(self.output_shape, dtype=self.output_dtype)
+                binding.bind_output(
+                    self.output_name,
+                    "cpu",
+                    0,
+                    self.output_dtype,
+                    self.output_shape,
+                    logit.ctypes.data,
+                )
+                self._logit = logit
+            else:
+                binding.bind_output(self.output_name, "cpu")
+        except (AttributeError, TypeError, RuntimeError):
+            self._logit = None
+            return
+        self._binding = binding
+
+    def _infer(self):
+        if self._binding is None:
+            return self.model.run([self.output_name], {self.input_name: self._input})[0]
+        self.model.run_with_iobinding(self._binding)
+        if self._logit is not None:
+            return self._logit
+        return self._binding.copy_outputs_to_cpu()[0]
+
+    def _run_batch(self, input_data):
+        return self.model.run([self.output_name], {self.input_name: input_data})[0]
+
+    def act(self, infoset):
+        obs = self._encode_obs(infoset)
+        input_size = self._input_size(obs)
+        if self._input is None or self._input.shape[1] != input_size:
+            self._bind(input_size)
+        self._write_input(obs, self._input[0])
+        return self._decode(self._infer(), obs)
+
+    def act_batch(self, infosets):
+        """Decide for several games at once with a single ``run()`` call."""
+        if not self.supports_batch:
+            return [self.act(infoset) for infoset in infosets]
+        observations = [self._encode_obs(infoset) for infoset in infosets]
+        input_data = np.empty(
+            (len(observations), self._input_size(observations[0])),
+            dtype=self.input_dtype,
+        )
+        for obs, row in zip(observations, input_data):
+            self._write_input(obs, row)
+        logits = self._run_batch(input_data)
+        return [self._decode(logit, obs) for logit, obs in zip(logits, observations)]
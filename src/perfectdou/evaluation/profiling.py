@@ -0,0 +1,142 @@
+"""
+Opt-in per-phase timers for evaluation workers.
+
+When profiling is on, each worker wraps the methods its agents list in
+``PROFILE_PHASES`` (encoding, inference, decoding), their ``act`` and
+``act_batch``, and ``GameEnv.step`` with timers keyed by
+``(agent type, position, phase)``. ``GameEnv.step`` is charged without
+the ``act`` call it makes, so its rows are the game logic alone.
+Durations go into log-spaced buckets, which keeps every key a few
+counters large and lets workers' numbers be summed; p99 is read off the
+buckets to within about 10%.
+"""
+
+import math
+import time
+
+# Buckets per doubling of the duration.
+BUCKETS_PER_OCTAVE = 8
+
+
+class PhaseStats:
+    __slots__ = ("count", "total", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.buckets = {}
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        bucket = int(math.floor(math.log2(max(seconds, 1e-9)) * BUCKETS_PER_OCTAVE))
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def merge(self, other):
+        self.count += other.count
+        self.total += other.total
+        for bucket, count in other.buckets.items():
+            self.buckets[bucket] = self.buckets.get(bucket, 0) + count
+
+    def quantile(self, q):
+        """Upper edge of the bucket holding the ``q`` quantile, in seconds."""
+        rank = q * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return 2.0 ** ((bucket + 1) / BUCKETS_PER_OCTAVE)
+        return 0.0
+
+
+class Profiler:
+    def __init__(self):
+        self.phases = {}
+        # Time spent in act during the current GameEnv.step.
+        self._act_seconds = 0.0
+
+    def add(self, key, seconds):
+        stats = self.phases.get(key)
+        if stats is None:
+            stats = self.phases[key] = PhaseStats()
+        stats.add(seconds)
+
+    def timed(self, fn, key, is_act=False):
+        perf_counter = time.perf_counter
+
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            result = fn(*args, **kwargs)
+            seconds = perf_counter() - start
+            self.add(key, seconds)
+            if is_act:
+                self._act_seconds += seconds
+            return result
+
+        return wrapper
+
+    def instrument_agent(self, agent, position):
+        """Time ``agent`` in place; agents shared between tables are timed once."""
+        if getattr(agent, "_profiled", False):
+            return
+        agent_type = type(agent).__name__
+        phases = dict(getattr(agent, "PROFILE_PHASES", {}))
+        phases.update(act="act", act_batch="act_batch")
+        for name, phase in phases.items():
+            method = getattr(agent, name, None)
+            if method is not None:
+                setattr(
+                    agent,
+                    name,
+                    self.timed(method, (agent_type, position, phase), name == "act"),
+                )
+        agent._profiled = True
+
+    def instrument_env(self, env):
+        step = env.step
+        perf_counter = time.perf_counter
+
+        def timed_step():
+            position = env.acting_player_position
+            self._act_seconds = 0.0
+            start = perf_counter()
+            step()
+            self.add(
+                ("GameEnv", position, "step"),
+                perf_counter() - start - self._act_seconds,
+            )
+
+        env.step = timed_step
+
+    def take(self):
+        """Return the timers gathered since the last call and start over."""
+        phases, self.phases = self.phases, {}
+        return phases
+
+
+def merge_phases(total, phases):
+    for key, stats in phases.items():
+        if key in total:
+            total[key].merge(stats)
+        else:
+            total[key] = stats
+
+
+def print_phases(phases):
+    print("Phase timings:")
+    print(
+        "{:<18} {:<14} {:<10} {:>10} {:>10} {:>10} {:>10}".format(
+            "agent", "position", "phase", "calls", "total s", "mean ms", "p99 ms"
+        )
+    )
+    for key in sorted(phases, key=lambda key: -phases[key].total):
+        stats = phases[key]
+        print(
+            "{:<18} {:<14} {:<10} {:>10} {:>10.2f} {:>10.3f} {:>10.3f}".format(
+                *key,
+                stats.count,
+                stats.total,
+                1000 * stats.total / stats.count,
+                1000 * stats.quantile(0.99),
+            )
+        )
@@ -0,0 +1,87 @@
+"""
+Per-game results and the on-disk run log used to resume evaluations.
+
+Every worker appends one JSON line per finished game to its own
+``worker-<id>.jsonl`` in the log directory and flushes after each chunk,
+so a killed run loses at most the chunks that were in flight. The parent
+periodically writes ``checkpoint.json`` with the run configuration and a
+progress summary; ``--resume`` re-reads the logs and only plays the
+deals that have not finished yet.
+"""
+
+import glob
+import json
+import os
+import time
+from collections import namedtuple
+
+GameResult = namedtuple(
+    "GameResult",
+    [
+        "deal_index",
+        "landlord_win",
+        "landlord_score",
+        "farmer_score",
+        "bomb_num",
+        "steps",
+        "seconds",
+    ],
+)
+
+CHECKPOINT_NAME = "checkpoint.json"
+
+
+class GameLog:
+    """Append-only log of the games played by one worker."""
+
+    def __init__(self, log_dir, worker_id):
+        os.makedirs(log_dir, exist_ok=True)
+        self.path = os.path.join(log_dir, "worker-{}.jsonl".format(worker_id))
+        self._file = open(self.path, "a")
+
+    def write(self, table, results):
+        for result in results:
+            record = result._asdict()
+            record["table"] = table
+            record["winner"] = "landlord" if result.landlord_win else "farmer"
+            self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
+
+
+def read_game_logs(log_dir):
+    """
+    Return ``{table: {deal_index: GameResult}}`` from every worker log.
+    A line cut short by a killed worker is ignored.
+    """
+    results = {}
+    for path in sorted(glob.glob(os.path.join(log_dir, "worker-*.jsonl"))):
+        with open(path) as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                result = GameResult(*(record[field] for field in GameResult._fields))
+                results.setdefault(record["table"], {})[result.deal_index] = result
+    return results
+
+
+def write_checkpoint(log_dir, config, progress):
+    os.makedirs(log_dir, exist_ok=True)
+    path = os.path.join(log_dir, CHECKPOINT_NAME)
+    state = {"config": config, "progress": progress, "time": time.time()}
+    with open(path + ".tmp", "w") as f:
+        json.dump(state, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+
+def read_checkpoint(log_dir):
+    path = os.path.join(log_dir, CHECKPOINT_NAME)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
@@ -0,0 +1,88 @@
+"""
+Split a CPU budget between evaluation workers and model threads.
+
+A plan gives every worker a disjoint set of cores and the same number of
+intra-op threads, so that workers neither migrate between cores nor
+compete with each other's inference threads. Pinning uses
+``os.sched_setaffinity`` and is skipped where it is not available.
+"""
+
+import os
+from collections import namedtuple
+
+
+def available_cpus():
+    """The cores this process may run on, in ascending order."""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+class ResourcePlan(
+    namedtuple("ResourcePlan", ["num_workers", "intra_op_threads", "cpu_sets"])
+):
+    """
+    ``cpu_sets`` holds one core list per worker, or is ``None`` when the
+    workers are not pinned. ``intra_op_threads`` is ``None`` to keep each
+    agent's default.
+    """
+
+    def worker(self, worker_id):
+        """The ``(cpu_set, intra_op_threads)`` of one worker."""
+        cpu_set = None if self.cpu_sets is None else self.cpu_sets[worker_id]
+        return cpu_set, self.intra_op_threads
+
+    def describe(self):
+        return "{} workers x {} intra-op threads ({})".format(
+            self.num_workers,
+            self.intra_op_threads or "default",
+            "pinned" if self.cpu_sets is not None else "not pinned",
+        )
+
+
+def plan_resources(cpu_budget=None, num_workers=None, intra_op_threads=None):
+    """
+    Fill in whatever is missing of workers x threads from ``cpu_budget``
+    cores (all available cores by default) and give each worker its own
+    consecutive cores. A split that needs more cores than the budget is
+    kept but left unpinned.
+    """
+    cpus = available_cpus()
+    if cpu_budget is None:
+        cpu_budget = len(cpus)
+    if not 0 < cpu_budget <= len(cpus):
+        raise ValueError(
+            "CPU budget {} is not within the {} available cores".format(
+                cpu_budget, len(cpus)
+            )
+        )
+    if intra_op_threads is None:
+        intra_op_threads = max(1, cpu_budget // num_workers) if num_workers else 1
+    if num_workers is None:
+        num_workers = max(1, cpu_budget // intra_op_threads)
+
+    if num_workers * intra_op_threads > cpu_budget:
+        return ResourcePlan(num_workers, intra_op_threads, None)
+    cpu_sets = [
+        cpus[worker_id * intra_op_threads : (worker_id + 1) * intra_op_threads]
+        for worker_id in range(num_workers)
+    ]
+    return ResourcePlan(num_workers, intra_op_threads, cpu_sets)
+
+
+def candidate_plans(cpu_budget=None):
+    """Every split of the budget with a power-of-two thread count."""
+    if cpu_budget is None:
+        cpu_budget = len(available_cpus())
+    plans = []
+    intra_op_threads = 1
+    while intra_op_threads <= cpu_budget:
+        plans.append(plan_resources(cpu_budget, intra_op_threads=intra_op_threads))
+        intra_op_threads *= 2
+    return plans
+
+
+def pin_worker(cpu_set):
+    """Restrict the calling process to ``cpu_set``, where supported."""
+    if cpu_set is not None and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cpu_set)
@@ -1,6 +1,15 @@
+import functools
 import random
 
-from rlcard.games.doudizhu.utils import CARD_TYPE
+from perfectdou.cards import (
+    NUM_CHAIN_SLOTS,
+    RANK_SLOT,
+    RANKS,
+    env_key,
+    key_counts,
+    rank_key,
+)
+from .card_types import card_type_table
 
 EnvCard2RealCard = {
     3: "3",
@@ -55,78 +64,73 @@ INDEX = {
     "R": 14,
 }
 
+COMBINATIONS = (
+    "rocket",
+    "bomb",
+    "trio",
+    "trio_chain",
+    "solo_chain",
+    "pair_chain",
+    "pair",
+    "solo",
+)
+# Distinct hands kept by the combine_cards memo.
+COMBINE_CACHE_SIZE = 1 << 14
+
 
 class RLCardAgent(object):
+    """
+    RLCard's rule-based Dou Dizhu agent. Leads with a combination that
+    holds its lowest card and follows with the lowest move of the same
+    type; anything the rules do not cover is played at random. Moves are
+    typed through ``card_type_table`` and the infoset is only read.
+    """
+
     def __init__(self, position):
         self.name = "RLCard"
         self.position = position
+        self.card_types = card_type_table().types
+
+    def _lead(self, infoset):
+        hand_cards = infoset.player_hand_cards
+        action = None
+        min_card = EnvCard2RealCard[hand_cards[0]]
+        for acs in _combine_key(env_key(hand_cards)):
+            for ac in acs:
+                if min_card in ac:
+                    action = [RealCard2EnvCard[c] for c in ac]
+        return action
+
+    def _follow(self, infoset):
+        card_types = self.card_types
+        the_type = card_types[env_key(infoset.last_move)][0]
+        chosen_action = None
+        rank = 1000
+        for ac in infoset.legal_actions:
+            if not ac:
+                continue
+            # An untyped move sends the whole decision to the random fallback.
+            ac_type, ac_rank = card_types[env_key(ac)]
+            if ac_type == the_type and ac_rank < rank:
+                rank = ac_rank
+                chosen_action = ac
+        if chosen_action is not None:
+            return list(chosen_action)
+        if infoset.last_pid != "landlord" and self.position != "landlord":
+            return []
+        return None
 
     def act(self, infoset):
         try:
-            # Hand cards
-            hand_cards = infoset.player_hand_cards
-            for i, c in enumerate(hand_cards):
-                hand_cards[i] = EnvCard2RealCard[c]
-            hand_cards = "".join(hand_cards)
-
-            # Last move
-            last_move = infoset.last_move.copy()
-            for i, c in enumerate(last_move):
-                last_move[i] = EnvCard2RealCard[c]
-            last_move = "".join(last_move)
-
-            # Last two moves
-            last_two_cards = infoset.last_two_moves
-            for i in range(2):
-                for j, c in enumerate(last_two_cards[i]):
-                    last_two_cards[i][j] = EnvCard2RealCard[c]
-                last_two_cards[i] = "".join(last_two_cards[i])
-
-            # Last pid
-            last_pid = infoset.last_pid
-
-            action = None
-            # the rule of leading round
-            if last_two_cards[0] == "" and last_two_cards[1] == "":
-                chosen_action = None
-                comb = combine_cards(hand_cards)
-                min_card = hand_cards[0]
-                for _, acs in comb.items():
-                    for ac in acs:
-                        if min_card in ac:
-                            chosen_action = ac
-                            action = [char for char in chosen_action]
-                            for i, c in enumerate(action):
-                                action[i] = RealCard2EnvCard[c]
-                            # print('lead action:', action)
-            # the rule of following cards
+            last_two_moves = infoset.last_two_moves
+            if not last_two_moves[0] and not last_two_moves[1]:
+                action = self._lead(infoset)
             else:
-                the_type = CARD_TYPE[0][last_move][0][0]
-                chosen_action = ""
-                rank = 1000
-                for ac in infoset.legal_actions:
-                    _ac = ac.copy()
-                    for i, c in enumerate(_ac):
-                        _ac[i] = EnvCard2RealCard[c]
-                    _ac = "".join(_ac)
-                    if _ac != "" and the_type == CARD_TYPE[0][_ac][0][0]:
-                        if int(CARD_TYPE[0][_ac][0][1]) < rank:
-                            rank = int(CARD_TYPE[0][_ac][0][1])
-                            chosen_action = _ac
-                if chosen_action != "":
-                    action = [char for char in chosen_action]
-                    for i, c in enumerate(action):
-                        action[i] = RealCard2EnvCard[c]
-                    # print('action:', action)
-                elif last_pid != "landlord" and self.position != "landlord":
-                    action = []
-
+                action = self._follow(infoset)
             if action is None:
                 action = random.choice(infoset.legal_actions)
-        except:
+        except Exception:
             action = random.choice(infoset.legal_actions)
-            # import traceback
-            # traceback.print_exc()
 
         assert action in infoset.legal_actions
 
@@ -149,94 +153,86 @@ def list2card_str(hand_list):
 
 
 def pick_chain(hand_list, count):
+    """
+    Take every run of at least 5 ranks below the 2 out of the counts in
+    ``hand_list``, as often as its lowest count allows ``count`` cards a
+    rank; the run's whole lowest count is used up either way.
+    """
     chains = []
-    str_card = [card for card in INDEX]
-    hand_list = [str(card) for card in hand_list]
-    hand = "".join(hand_list[:12])
-    chain_list = hand.split("0")
-    add = 0
-    for index, chain in enumerate(chain_list):
-        if len(chain) > 0:
-            if len(chain) >= 5:
-                start = index + add
-                min_count = int(min(chain)) // count
-                if min_count != 0:
-                    str_chain = ""
-                    for num in range(len(chain)):
-                        str_chain += str_card[start + num]
-                        hand_list[start + num] = int(hand_list[start + num]) - int(
-                            min(chain)
-                        )
-                    for _ in range(min_count):
-                        chains.append(str_chain)
-            add += len(chain)
-    hand_list = [int(card) for card in hand_list]
+    hand_list = list(hand_list)
+    start = 0
+    while start < NUM_CHAIN_SLOTS:
+        if not hand_list[start]:
+            start += 1
+            continue
+        stop = start + 1
+        while stop < NUM_CHAIN_SLOTS and hand_list[stop]:
+            stop += 1
+        if stop - start >= 5:
+            lowest = min(hand_list[start:stop])
+            if lowest // count:
+                for slot in range(start, stop):
+                    hand_list[slot] -= lowest
+                chains.extend([RANKS[start:stop]] * (lowest // count))
+        start = stop
     return (chains, hand_list)
 
 
-def combine_cards(hand):
-    """Get optimal combinations of cards in hand"""
-    comb = {
-        "rocket": [],
-        "bomb": [],
-        "trio": [],
-        "trio_chain": [],
-        "solo_chain": [],
-        "pair_chain": [],
-        "pair": [],
-        "solo": [],
-    }
+@functools.lru_cache(maxsize=COMBINE_CACHE_SIZE)
+def _combine_key(key):
+    """``combine_cards`` of the hand with action key ``key``, as tuples."""
+    counts = key_counts(key)
     # 1. pick rocket
-    if hand[-2:] == "BR":
-        comb["rocket"].append("BR")
-        hand = hand[:-2]
+    rocket = []
+    if counts[RANK_SLOT["B"]] and counts[RANK_SLOT["R"]]:
+        rocket.append("BR")
+        counts[RANK_SLOT["B"]] = counts[RANK_SLOT["R"]] = 0
     # 2. pick bomb
-    hand_cp = hand
-    for index in range(len(hand_cp) - 3):
-        if hand_cp[index] == hand_cp[index + 3]:
-            bomb = hand_cp[index : index + 4]
-            comb["bomb"].append(bomb)
-            hand = hand.replace(bomb, "")
-    # 3. pick trio and trio_chain
-    hand_cp = hand
-    for index in range(len(hand_cp) - 2):
-        if hand_cp[index] == hand_cp[index + 2]:
-            trio = hand_cp[index : index + 3]
-            if (
-                len(comb["trio"]) > 0
-                and INDEX[trio[-1]] < 12
-                and (INDEX[trio[-1]] - 1) == INDEX[comb["trio"][-1][-1]]
-            ):
-                comb["trio"][-1] += trio
+    bomb = []
+    for slot, count in enumerate(counts):
+        if count == 4:
+            bomb.append(RANKS[slot] * 4)
+            counts[slot] = 0
+    # 3. pick trio and trio_chain, extending a chain up to the ace
+    runs = []
+    for slot, count in enumerate(counts):
+        if count == 3:
+            if runs and slot < RANK_SLOT["2"] and runs[-1][-1] == slot - 1:
+                runs[-1].append(slot)
             else:
-                comb["trio"].append(trio)
-            hand = hand.replace(trio, "")
-    only_trio = []
-    only_trio_chain = []
-    for trio in comb["trio"]:
-        if len(trio) == 3:
-            only_trio.append(trio)
-        else:
-            only_trio_chain.append(trio)
-    comb["trio"] = only_trio
-    comb["trio_chain"] = only_trio_chain
+                runs.append([slot])
+            counts[slot] = 0
+    trios = ["".join(RANKS[slot] * 3 for slot in run) for run in runs]
+    trio = [cards for cards in trios if len(cards) == 3]
+    trio_chain = [cards for cards in trios if len(cards) > 3]
     # 4. pick solo chain
-    hand_list = card_str2list(hand)
-    chains, hand_list = pick_chain(hand_list, 1)
-    comb["solo_chain"] = chains
-    # 5. pick par_chain
-    chains, hand_list = pick_chain(hand_list, 2)
-    comb["pair_chain"] = chains
-    hand = list2card_str(hand_list)
+    solo_chain, counts = pick_chain(counts, 1)
+    # 5. pick pair chain
+    pair_chain, counts = pick_chain(counts, 2)
     # 6. pick pair and solo
-    index = 0
-    while index < len(hand) - 1:
-        if hand[index] == hand[index + 1]:
-            comb["pair"].append(hand[index] + hand[index + 1])
-            index += 2
-        else:
-            comb["solo"].append(hand[index])
-            index += 1
-    if index == (len(hand) - 1):
-        comb["solo"].append(hand[index])
-    return comb
+    pair = [RANKS[slot] * 2 for slot, count in enumerate(counts) if count == 2]
+    solo = [RANKS[slot] for slot, count in enumerate(counts) if count == 1]
+    return tuple(
+        tuple(combs)
+        for combs in (
+            rocket,
+            bomb,
+            trio,
+            trio_chain,
+            solo_chain,
+            pair_chain,
+            pair,
+            solo,
+        )
+    )
+
+
+def combine_cards(hand):
+    """
+    Get optimal combinations of cards in hand, a rank string sorted like
+    the env's hands. Results are memoized by the hand's count vector.
+    """
+    return {
+        name: list(combs)
+        for name, combs in zip(COMBINATIONS, _combine_key(rank_key(hand)))
+    }
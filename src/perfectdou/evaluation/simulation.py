@@ -1,122 +1,728 @@
 import multiprocessing as mp
-import pickle
+import os
+import queue
+import time
 
 from perfectdou.env.game import GameEnv
+from .deal_file import DealFile, as_deal_file
+from .records import (
+    GameLog,
+    GameResult,
+    read_checkpoint,
+    read_game_logs,
+    write_checkpoint,
+)
+from .profiling import Profiler, merge_phases, print_phases
+from .resources import ResourcePlan, candidate_plans, pin_worker
+from .stats import OutcomeStats, PairedStats
 
 
-def load_card_play_models(card_play_model_path_dict):
+def _bundled_variant(model_path):
+    """
+    The variant of a bundled PerfectDou spec such as ``perfectdou_int8``,
+    or ``None``. Paths that merely start with ``perfectdou_`` (e.g.
+    ``perfectdou_ckpts/landlord.ckpt``) are not variants.
+    """
+    prefix = "perfectdou_"
+    variant = model_path[len(prefix) :]
+    if (
+        not model_path.startswith(prefix)
+        or not variant.replace("_", "").isalnum()
+        or os.path.exists(model_path)
+    ):
+        return None
+    return variant
+
+
+def load_agent(position, model_path, intra_op_threads=None):
+    """
+    Build the agent named by ``model_path``. ``intra_op_threads`` sizes
+    the inference thread pool of model-backed agents (``None`` keeps
+    their default).
+    """
+    if model_path == "rlcard":
+        from .rlcard_agent import RLCardAgent
+
+        return RLCardAgent(position)
+    elif model_path == "random":
+        from .random_agent import RandomAgent
+
+        return RandomAgent()
+    elif model_path == "perfectdou":
+        from .perfectdou_agent import PerfectDouAgent
+
+        return PerfectDouAgent(position, intra_op_threads or 1)
+    elif _bundled_variant(model_path) is not None:
+        from .perfectdou_agent import PerfectDouAgent
+
+        # Bundled variants, e.g. perfectdou_int8 loads landlord.int8.onnx.
+        variant = _bundled_variant(model_path)
+        return PerfectDouAgent(position, intra_op_threads or 1, variant)
+    elif model_path == "douzero":
+        from .deep_agent import DeepAgent
+
+        return DeepAgent(
+            position,
+            "perfectdou/model/douzero/douzero_ADP/{}.ckpt".format(position),
+            intra_op_threads,
+        )
+    elif model_path == "douzero_onnx":
+        from .douzero_onnx_agent import DouZeroOnnxAgent
+
+        return DouZeroOnnxAgent(
+            position,
+            "perfectdou/model/douzero/douzero_ADP/{}.onnx".format(position),
+            intra_op_threads or 1,
+        )
+    else:
+        if os.path.isdir(model_path):
+            # A checkpoint directory holds one {position}.ckpt (or an
+            # exported {position}.onnx) per seat.
+            checkpoint = os.path.join(model_path, "{}.ckpt".format(position))
+            if not os.path.exists(checkpoint):
+                checkpoint = os.path.join(model_path, "{}.onnx".format(position))
+            model_path = checkpoint
+        if model_path.endswith(".onnx"):
+            from .douzero_onnx_agent import DouZeroOnnxAgent
+
+            return DouZeroOnnxAgent(position, model_path, intra_op_threads or 1)
+
+        from .deep_agent import DeepAgent
+
+        return DeepAgent(position, model_path, intra_op_threads)
+
+
+def load_card_play_models(card_play_model_path_dict, cache=None, intra_op_threads=None):
+    """
+    Build the three seats. With a ``cache`` dict, agents are shared by
+    ``(position, model_path)`` so a long-lived worker loads each model once.
+    """
     players = {}
 
     for position in ["landlord", "landlord_up", "landlord_down"]:
-        if card_play_model_path_dict[position] == "rlcard":
-            from .rlcard_agent import RLCardAgent
+        model_path = card_play_model_path_dict[position]
+        if cache is None:
+            players[position] = load_agent(position, model_path, intra_op_threads)
+            continue
+        key = (position, model_path)
+        if key not in cache:
+            cache[key] = load_agent(position, model_path, intra_op_threads)
+        players[position] = cache[key]
+    return players
 
-            players[position] = RLCardAgent(position)
-        elif card_play_model_path_dict[position] == "random":
-            from .random_agent import RandomAgent
 
-            players[position] = RandomAgent()
-        elif card_play_model_path_dict[position] == "perfectdou":
-            from .perfectdou_agent import PerfectDouAgent
+class ScriptedAgent:
+    """
+    Plays whatever action it was told last. The lockstep loop decides
+    outside of ``GameEnv`` and feeds the result back through this seat,
+    the same way DouZero's ``DummyAgent`` isolates agents from the env.
+    """
 
-            players[position] = PerfectDouAgent(position)
-        elif card_play_model_path_dict[position] == "douzero":
-            from .deep_agent import DeepAgent
+    def __init__(self, position):
+        self.position = position
+        self.action = None
 
-            players[position] = DeepAgent(
-                position,
-                "perfectdou/model/douzero/douzero_ADP/{}.ckpt".format(position),
-            )
-        else:
-            from .deep_agent import DeepAgent
+    def act(self, infoset):
+        return self.action
 
-            players[position] = DeepAgent(position, card_play_model_path_dict[position])
-    return players
+    def set_action(self, action):
+        self.action = action
 
 
-def mp_simulate(card_play_data_list, card_play_model_path_dict, q):
+def _act_many(agent, infosets):
+    if hasattr(agent, "act_batch"):
+        return agent.act_batch(infosets)
+    return [agent.act(infoset) for infoset in infosets]
+
+
+def _start_game(env, card_play_data):
+    env.card_play_init(card_play_data)
+    return (
+        env.num_wins["landlord"],
+        env.num_scores["landlord"],
+        env.num_scores["farmer"],
+        time.perf_counter(),
+    )
+
+
+def _finish_game(env, deal_index, before, steps):
+    result = GameResult(
+        deal_index,
+        env.num_wins["landlord"] - before[0],
+        env.num_scores["landlord"] - before[1],
+        env.num_scores["farmer"] - before[2],
+        env.bomb_num,
+        steps,
+        time.perf_counter() - before[3],
+    )
+    env.reset()
+    return result
 
-    players = load_card_play_models(card_play_model_path_dict)
 
-    env = GameEnv(players)
-    for idx, card_play_data in enumerate(card_play_data_list):
-        env.card_play_init(card_play_data)
+def play_sequential(env, deals):
+    """Play ``(deal_index, card_play_data)`` pairs one after another."""
+    results = []
+    for deal_index, card_play_data in deals:
+        before = _start_game(env, card_play_data)
+        steps = 0
         while not env.game_over:
             env.step()
-        env.reset()
+            steps += 1
+        results.append(_finish_game(env, deal_index, before, steps))
+    return results
 
-    q.put(
-        (
-            env.num_wins["landlord"],
-            env.num_wins["farmer"],
-            env.num_scores["landlord"],
-            env.num_scores["farmer"],
+
+def play_lockstep(envs, players, deals):
+    """
+    Advance up to ``len(envs)`` games at once. Every round the pending
+    decisions are grouped by position so that agents with an ``act_batch``
+    method answer all of them with one inference call. The envs must be
+    seated with ``ScriptedAgent`` players. A game's ``seconds`` is the
+    wall time from its first to its last round.
+    """
+    results = []
+    deals = iter(deals)
+    # [env, deal_index, before, steps] for every game in flight.
+    active = []
+    for env in envs:
+        deal = next(deals, None)
+        if deal is None:
+            break
+        active.append([env, deal[0], _start_game(env, deal[1]), 0])
+
+    while active:
+        waiting = {}
+        for game in active:
+            waiting.setdefault(game[0].acting_player_position, []).append(game)
+        for position, games in waiting.items():
+            actions = _act_many(
+                players[position], [game[0].game_infoset for game in games]
+            )
+            for game, action in zip(games, actions):
+                game[0].players[position].set_action(action)
+                game[0].step()
+                game[3] += 1
+
+        still_active = []
+        for game in active:
+            env = game[0]
+            if env.game_over:
+                results.append(_finish_game(env, *game[1:]))
+                deal = next(deals, None)
+                if deal is None:
+                    continue
+                game[1:] = [deal[0], _start_game(env, deal[1]), 0]
+            still_active.append(game)
+        active = still_active
+    return results
+
+
+class Table:
+    """One seat configuration: the loaded agents and the envs they sit at."""
+
+    def __init__(
+        self,
+        card_play_model_path_dict,
+        lockstep_games=0,
+        cache=None,
+        intra_op_threads=None,
+        profiler=None,
+    ):
+        self.players = load_card_play_models(
+            card_play_model_path_dict, cache, intra_op_threads
         )
-    )
+        if profiler is not None:
+            for position, agent in self.players.items():
+                profiler.instrument_agent(agent, position)
+        self.lockstep_games = lockstep_games
+        if lockstep_games > 0:
+            self.envs = [
+                GameEnv(
+                    {position: ScriptedAgent(position) for position in self.players}
+                )
+                for _ in range(lockstep_games)
+            ]
+        else:
+            self.envs = [GameEnv(self.players)]
+        if profiler is not None:
+            for env in self.envs:
+                profiler.instrument_env(env)
+
+    def play(self, deals):
+        if self.lockstep_games > 0:
+            return play_lockstep(self.envs, self.players, deals)
+        return play_sequential(self.envs[0], deals)
 
 
-def data_allocation_per_worker(card_play_data_list, num_workers):
-    card_play_data_list_each_worker = [[] for k in range(num_workers)]
-    for idx, data in enumerate(card_play_data_list):
-        card_play_data_list_each_worker[idx % num_workers].append(data)
+def mp_simulate(
+    task_queue,
+    eval_data,
+    card_play_model_path_dicts,
+    q,
+    lockstep_games=0,
+    stop_event=None,
+    worker_id=0,
+    log_dir=None,
+    resources=None,
+    profile=False,
+):
+    """
+    Worker loop: pull chunks of deal indices until the ``None`` sentinel
+    (or until ``stop_event`` is set), read them from the memory-mapped
+    deal file and play them at every seat configuration in
+    ``card_play_model_path_dicts``. The per-game results of each chunk
+    are appended to this worker's log in ``log_dir`` and sent back as
+    soon as it is played, so that fast workers keep taking work while
+    slow ones finish theirs. ``resources`` is this worker's
+    ``(cpu_set, intra_op_threads)`` from a ``ResourcePlan``. With
+    ``profile`` each message also carries the chunk's phase timers.
+    """
+    cpu_set, intra_op_threads = resources or (None, None)
+    # Pin before any model creates its thread pool.
+    pin_worker(cpu_set)
+    deals = DealFile(eval_data)
+    cache = {}
+    profiler = Profiler() if profile else None
+    tables = [
+        Table(
+            card_play_model_path_dict,
+            lockstep_games,
+            cache,
+            intra_op_threads,
+            profiler,
+        )
+        for card_play_model_path_dict in card_play_model_path_dicts
+    ]
+    log = GameLog(log_dir, worker_id) if log_dir is not None else None
 
-    return card_play_data_list_each_worker
+    while stop_event is None or not stop_event.is_set():
+        task = task_queue.get()
+        if task is None:
+            break
 
+        start_time = time.perf_counter()
+        results = [
+            # Each table gets fresh deal lists since the env consumes them.
+            table.play(list(zip(task, deals.take(task))))
+            for table in tables
+        ]
+        if log is not None:
+            for table_index, table_results in enumerate(results):
+                log.write(table_index, table_results)
+        phases = profiler.take() if profiler is not None else None
+        q.put((results, time.perf_counter() - start_time, phases))
+    if log is not None:
+        log.close()
+    q.put(None)
 
-def evaluate(landlord, landlord_up, landlord_down, eval_data, num_workers):
-    # all_result = []
 
-    # for index in range(1500,2557501,1500*170):
-    with open(eval_data, "rb") as f:
-        card_play_data_list = pickle.load(f)
+def data_chunks(num_deals, chunk_size, finished=None):
+    """Yield chunks of deal indices, leaving out the ``finished`` ones."""
+    if not finished:
+        for start in range(0, num_deals, chunk_size):
+            yield range(start, min(start + chunk_size, num_deals))
+        return
+    pending = [index for index in range(num_deals) if index not in finished]
+    for start in range(0, len(pending), chunk_size):
+        yield pending[start : start + chunk_size]
 
-    card_play_data_list_each_worker = data_allocation_per_worker(
-        card_play_data_list, num_workers
-    )
-    del card_play_data_list
 
-    card_play_model_path_dict = {
-        "landlord": landlord,
-        "landlord_up": landlord_up,
-        "landlord_down": landlord_down,
+def _next_result(q, processes):
+    while True:
+        try:
+            return q.get(timeout=1.0)
+        except queue.Empty:
+            for p in processes:
+                if p.exitcode not in (None, 0):
+                    for other in processes:
+                        other.terminate()
+                    raise RuntimeError(
+                        "Evaluation worker {} exited with code {}".format(
+                            p.pid, p.exitcode
+                        )
+                    )
+
+
+def _add_logged_results(stats, logged, num_tables):
+    """
+    Feed the logged games of deals finished at every table into ``stats``
+    and return their indices. A deal whose chunk was cut short at one of
+    the tables is played again in full.
+    """
+    tables = [logged.get(table, {}) for table in range(num_tables)]
+    finished = set(tables[0])
+    for table_results in tables[1:]:
+        finished &= set(table_results)
+    for deal_index in sorted(finished):
+        stats.add(*(table_results[deal_index] for table_results in tables))
+    return finished
+
+
+def _progress(stats, num_deals):
+    return {
+        "num_deals": num_deals,
+        "num_finished": stats.num_games,
+        "num_pending": num_deals - stats.num_games,
     }
 
-    num_landlord_wins = 0
-    num_farmer_wins = 0
-    num_landlord_scores = 0
-    num_farmer_scores = 0
 
-    ctx = mp.get_context("spawn")
-    q = ctx.SimpleQueue()
-    processes = []
-    for card_paly_data in card_play_data_list_each_worker:
-        p = ctx.Process(
-            target=mp_simulate, args=(card_paly_data, card_play_model_path_dict, q)
-        )
-        p.start()
-        processes.append(p)
-
-    for p in processes:
-        p.join()
-
-    for i in range(num_workers):
-        result = q.get()
-        num_landlord_wins += result[0]
-        num_farmer_wins += result[1]
-        num_landlord_scores += result[2]
-        num_farmer_scores += result[3]
-
-        num_total_wins = num_landlord_wins + num_farmer_wins
+def _print_outcomes(stats, confidence):
+    num_games = stats.num_games
     print("WP results:")
     print(
         "landlord : Farmers - {} : {}".format(
-            num_landlord_wins / num_total_wins, num_farmer_wins / num_total_wins
+            stats.num_landlord_wins / num_games, stats.num_farmer_wins / num_games
+        )
+    )
+    print(
+        "landlord WP {:.0%} CI: [{:.4f}, {:.4f}]".format(
+            confidence, *stats.wp_interval(confidence)
         )
     )
     print("ADP results:")
     print(
         "landlord : Farmers - {} : {}".format(
-            num_landlord_scores / num_total_wins,
-            2 * num_farmer_scores / num_total_wins,
+            stats.num_landlord_scores / num_games,
+            2 * stats.num_farmer_scores / num_games,
+        )
+    )
+    print(
+        "landlord ADP {:.0%} CI: [{:.4f}, {:.4f}]".format(
+            confidence, *stats.adp_interval(confidence)
+        )
+    )
+
+
+def _print_duplicate(stats, card_play_model_path_dicts, confidence):
+    for name, stats_plain, seats in zip("AB", stats.plain, card_play_model_path_dicts):
+        print(
+            "Seat configuration {} (landlord: {}, farmers: {} / {}):".format(
+                name, seats["landlord"], seats["landlord_up"], seats["landlord_down"]
+            )
+        )
+        _print_outcomes(stats_plain, confidence)
+    print("Duplicate results (A as landlord minus B as landlord, same deal):")
+    print(
+        "WP delta: {:.4f}, {:.0%} CI: [{:.4f}, {:.4f}]".format(
+            stats.wp_delta(), confidence, *stats.wp_interval(confidence)
+        )
+    )
+    print(
+        "ADP delta: {:.4f}, {:.0%} CI: [{:.4f}, {:.4f}]".format(
+            stats.adp_delta(), confidence, *stats.adp_interval(confidence)
+        )
+    )
+    print(
+        "Variance reduction over unpaired games: {:.2f}x".format(
+            stats.variance_reduction()
+        )
+    )
+
+
+def evaluate(
+    landlord,
+    landlord_up,
+    landlord_down,
+    eval_data,
+    num_workers,
+    lockstep_games=0,
+    chunk_size=100,
+    confidence=0.95,
+    early_stop=None,
+    duplicate=False,
+    log_dir=None,
+    resume=False,
+    checkpoint_interval=60.0,
+    plan=None,
+    profile=False,
+):
+    """
+    Play the deals in ``eval_data`` and print WP/ADP with ``confidence``
+    intervals. ``early_stop`` is an optional ``stats.EarlyStop`` rule that
+    is checked after every chunk; once it fires the workers stop taking
+    new chunks and the games played so far are reported.
+
+    With ``duplicate`` every deal is also replayed with the sides swapped:
+    ``landlord_up`` takes the landlord seat and ``landlord`` both farmer
+    seats, so ``landlord_up`` and ``landlord_down`` must be the same
+    agent. The paired per-deal differences are reported next to the plain
+    results, and ``early_stop`` margins then apply to those differences.
+
+    With ``log_dir`` every game is appended to a per-worker log there and
+    a checkpoint is written every ``checkpoint_interval`` seconds. With
+    ``resume`` the games already in ``log_dir`` are counted again and only
+    the remaining deals are played.
+
+    ``plan`` is an optional ``resources.ResourcePlan``; it then replaces
+    ``num_workers`` and decides each worker's cores and model threads.
+
+    With ``profile`` the workers time encoding, inference, decoding, act
+    and ``GameEnv.step`` per agent type and position, and the merged
+    timings are printed after the results.
+    """
+    if plan is None:
+        plan = ResourcePlan(num_workers, None, None)
+    num_workers = plan.num_workers
+    if resume and log_dir is None:
+        raise ValueError("resume needs the log_dir of the interrupted run")
+    if duplicate and early_stop is not None and early_stop.sprt is not None:
+        raise ValueError("SPRT on landlord WP is not defined for duplicate runs")
+    if duplicate and landlord_up != landlord_down:
+        # The swapped seating plays landlord_up against landlord, so the
+        # paired difference only compares one matchup when both farmers
+        # are the same agent.
+        raise ValueError(
+            "duplicate runs need the same agent in both farmer seats, got "
+            "{} and {}".format(landlord_up, landlord_down)
+        )
+
+    card_play_model_path_dicts = [
+        {
+            "landlord": landlord,
+            "landlord_up": landlord_up,
+            "landlord_down": landlord_down,
+        }
+    ]
+    if duplicate:
+        card_play_model_path_dicts.append(
+            {
+                "landlord": landlord_up,
+                "landlord_up": landlord,
+                "landlord_down": landlord,
+            }
+        )
+        stats = PairedStats()
+    else:
+        stats = OutcomeStats()
+    config = {
+        "agents": card_play_model_path_dicts,
+        "eval_data": os.path.abspath(eval_data),
+        "duplicate": duplicate,
+    }
+    finished = set()
+    if log_dir is not None:
+        checkpoint = read_checkpoint(log_dir)
+        if checkpoint is not None and not resume:
+            raise ValueError(
+                "{} already holds a run; pass resume or use a new log_dir".format(
+                    log_dir
+                )
+            )
+        if resume and checkpoint is not None:
+            if checkpoint["config"] != config:
+                raise ValueError(
+                    "{} was written by a run with different agents or data".format(
+                        log_dir
+                    )
+                )
+            finished = _add_logged_results(
+                stats, read_game_logs(log_dir), len(card_play_model_path_dicts)
+            )
+    num_resumed = stats.num_games
+    worker_seconds = 0.0
+    phases = {}
+
+    start_time = time.perf_counter()
+    ctx = mp.get_context("spawn")
+    task_queue = ctx.Queue()
+    # Chunks left behind after an early stop are never read.
+    task_queue.cancel_join_thread()
+    q = ctx.Queue()
+    stop_event = ctx.Event()
+
+    with as_deal_file(eval_data) as eval_data:
+        num_deals = len(DealFile(eval_data))
+        if log_dir is not None:
+            # Written up front so that even a run killed early can resume.
+            write_checkpoint(log_dir, config, _progress(stats, num_deals))
+        for task in data_chunks(num_deals, chunk_size, finished):
+            task_queue.put(task)
+        for _ in range(num_workers):
+            task_queue.put(None)
+
+        processes = []
+        # Worker logs of earlier attempts are appended to, never truncated.
+        for worker_id in range(num_workers):
+            p = ctx.Process(
+                target=mp_simulate,
+                args=(
+                    task_queue,
+                    eval_data,
+                    card_play_model_path_dicts,
+                    q,
+                    lockstep_games,
+                    stop_event,
+                    worker_id,
+                    log_dir,
+                    plan.worker(worker_id),
+                    profile,
+                ),
+            )
+            p.start()
+            processes.append(p)
+
+        # Aggregate chunk results while the workers are still running.
+        last_checkpoint = time.perf_counter()
+        num_finished = 0
+        while num_finished < num_workers:
+            message = _next_result(q, processes)
+            if message is None:
+                num_finished += 1
+                continue
+            results, elapsed, chunk_phases = message
+            worker_seconds += elapsed
+            if chunk_phases is not None:
+                merge_phases(phases, chunk_phases)
+            if duplicate:
+                swapped = {result.deal_index: result for result in results[1]}
+                for result in results[0]:
+                    stats.add(result, swapped[result.deal_index])
+            else:
+                for result in results[0]:
+                    stats.add(result)
+            if (
+                early_stop is not None
+                and not stop_event.is_set()
+                and early_stop.should_stop(stats)
+            ):
+                stop_event.set()
+            if (
+                log_dir is not None
+                and time.perf_counter() - last_checkpoint >= checkpoint_interval
+            ):
+                write_checkpoint(log_dir, config, _progress(stats, num_deals))
+                last_checkpoint = time.perf_counter()
+
+        for p in processes:
+            p.join()
+    wall_seconds = time.perf_counter() - start_time
+    if log_dir is not None:
+        write_checkpoint(log_dir, config, _progress(stats, num_deals))
+
+    num_games = (stats.num_games - num_resumed) * len(card_play_model_path_dicts)
+    if duplicate:
+        _print_duplicate(stats, card_play_model_path_dicts, confidence)
+    else:
+        _print_outcomes(stats, confidence)
+    if num_resumed:
+        print(
+            "Resumed {} deals from {}, played {} more".format(
+                num_resumed, log_dir, stats.num_games - num_resumed
+            )
+        )
+    if early_stop is not None:
+        print(
+            "Early stop: {} after {} of {} deals ({:.1%} of games saved)".format(
+                early_stop.reason or "not triggered",
+                stats.num_games,
+                num_deals,
+                1 - stats.num_games / num_deals,
+            )
+        )
+    print(
+        "Throughput ({}, {}):".format(
+            (
+                "lockstep x{}".format(lockstep_games)
+                if lockstep_games > 0
+                else "sequential"
+            ),
+            plan.describe(),
         )
     )
+    print(
+        "{:.2f} games/s overall, {:.2f} games/s per worker".format(
+            num_games / wall_seconds, num_games / max(worker_seconds, 1e-9)
+        )
+    )
+    if profile:
+        print_phases(phases)
+
+
+# Chunks per worker in an autotune trial, so every worker stays busy.
+AUTOTUNE_CHUNKS_PER_WORKER = 4
+
+
+def autotune(
+    card_play_model_path_dict,
+    eval_data,
+    cpu_budget=None,
+    num_deals=200,
+    lockstep_games=0,
+    chunks_per_worker=AUTOTUNE_CHUNKS_PER_WORKER,
+):
+    """
+    Play the first ``num_deals`` deals under every candidate split of
+    ``cpu_budget`` and return the plan with the highest throughput.
+
+    Each trial hands every worker at least ``chunks_per_worker`` chunks,
+    playing more deals than ``num_deals`` when a plan has many workers, so
+    that all of them run at once and contend for the machine as they
+    would in the real run. A plan is scored by wall-clock games per
+    second from the first chunk result to the last; the games of that
+    first result are left out with the time before it, which covers
+    spawning the workers and loading the models.
+    """
+    if num_deals <= 0:
+        raise ValueError("Autotune needs num_deals > 0, got {}".format(num_deals))
+    ctx = mp.get_context("spawn")
+    best_plan, best_rate = None, 0.0
+    with as_deal_file(eval_data) as eval_data:
+        num_available = len(DealFile(eval_data))
+        if num_available == 0:
+            raise ValueError("{} holds no deals to autotune on".format(eval_data))
+        for plan in candidate_plans(cpu_budget):
+            num_chunks = chunks_per_worker * plan.num_workers
+            plan_deals = min(max(num_deals, num_chunks), num_available)
+            chunk_size = max(1, plan_deals // num_chunks)
+            task_queue = ctx.Queue()
+            q = ctx.Queue()
+            for task in data_chunks(plan_deals, chunk_size):
+                task_queue.put(task)
+            for _ in range(plan.num_workers):
+                task_queue.put(None)
+            processes = []
+            for worker_id in range(plan.num_workers):
+                p = ctx.Process(
+                    target=mp_simulate,
+                    args=(
+                        task_queue,
+                        eval_data,
+                        [card_play_model_path_dict],
+                        q,
+                        lockstep_games,
+                        None,
+                        worker_id,
+                        None,
+                        plan.worker(worker_id),
+                    ),
+                )
+                p.start()
+                processes.append(p)
+
+            num_games, num_finished = 0, 0
+            first_result = last_result = None
+            while num_finished < plan.num_workers:
+                message = _next_result(q, processes)
+                if message is None:
+                    num_finished += 1
+                    continue
+                last_result = time.perf_counter()
+                if first_result is None:
+                    first_result = last_result
+                else:
+                    num_games += len(message[0][0])
+            for p in processes:
+                p.join()
+
+            rate = 0.0
+            if num_games:
+                rate = num_games / max(last_result - first_result, 1e-9)
+            print("Autotune: {}: {:.2f} games/s".format(plan.describe(), rate))
+            if rate > best_rate:
+                best_plan, best_rate = plan, rate
+    if best_plan is None:
+        # A trial needs two chunk results to be timed.
+        raise ValueError(
+            "Autotune timed no games; {} has too few deals".format(eval_data)
+        )
+    return best_plan
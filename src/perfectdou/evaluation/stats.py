@@ -0,0 +1,204 @@
+"""
+Running statistics over streamed game outcomes: confidence intervals for
+WP/ADP and the stopping rules used by ``evaluate`` to end a run early.
+"""
+
+import math
+from collections import Counter
+
+import numpy as np
+
+
+def normal_quantile(p):
+    """Inverse of the standard normal CDF (bisection on ``math.erf``)."""
+    lo, hi = -10.0, 10.0
+    for _ in range(100):
+        mid = (lo + hi) / 2
+        if 0.5 * (1 + math.erf(mid / math.sqrt(2))) < p:
+            lo = mid
+        else:
+            hi = mid
+    return (lo + hi) / 2
+
+
+def wilson_interval(successes, n, confidence=0.95):
+    if n == 0:
+        return 0.0, 1.0
+    z = normal_quantile(0.5 + confidence / 2)
+    p = successes / n
+    denom = 1 + z * z / n
+    center = (p + z * z / (2 * n)) / denom
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return center - half, center + half
+
+
+def bootstrap_mean_interval(value_counts, confidence=0.95, num_resamples=2000, seed=0):
+    """
+    Percentile bootstrap for the mean of a discrete sample given as
+    ``{value: count}``. Resampling draws multinomial counts over the
+    distinct values, so the cost does not grow with the number of games.
+    The values are sorted first: the dict's order depends on which chunk
+    finished first, and the seeded draws must not.
+    """
+    n = sum(value_counts.values())
+    if n == 0:
+        return float("nan"), float("nan")
+    items = sorted(value_counts.items())
+    values = np.array([value for value, _ in items], dtype=np.float64)
+    probs = np.array([count for _, count in items], dtype=np.float64) / n
+    rng = np.random.default_rng(seed)
+    means = rng.multinomial(n, probs, size=num_resamples) @ values / n
+    tail = (1 - confidence) / 2 * 100
+    lo, hi = np.percentile(means, [tail, 100 - tail])
+    return float(lo), float(hi)
+
+
+class OutcomeStats:
+    """Aggregates per-game landlord outcomes as they arrive."""
+
+    def __init__(self):
+        self.num_games = 0
+        self.num_landlord_wins = 0
+        self.num_landlord_scores = 0
+        self.num_farmer_scores = 0
+        self.landlord_score_counts = Counter()
+
+    def add(self, result):
+        self.num_games += 1
+        self.num_landlord_wins += result.landlord_win
+        self.num_landlord_scores += result.landlord_score
+        self.num_farmer_scores += result.farmer_score
+        self.landlord_score_counts[result.landlord_score] += 1
+
+    @property
+    def num_farmer_wins(self):
+        return self.num_games - self.num_landlord_wins
+
+    def wp_interval(self, confidence=0.95):
+        return wilson_interval(self.num_landlord_wins, self.num_games, confidence)
+
+    def adp_interval(self, confidence=0.95):
+        return bootstrap_mean_interval(self.landlord_score_counts, confidence)
+
+
+class SPRT:
+    """
+    Wald's sequential probability ratio test on the landlord win rate,
+    H0: p = p0 against H1: p = p1.
+    """
+
+    def __init__(self, p0, p1, alpha=0.05, beta=0.05):
+        if not 0 < p0 < p1 < 1:
+            raise ValueError("SPRT needs 0 < p0 < p1 < 1")
+        self.win_llr = math.log(p1 / p0)
+        self.loss_llr = math.log((1 - p1) / (1 - p0))
+        self.lower = math.log(beta / (1 - alpha))
+        self.upper = math.log((1 - beta) / alpha)
+
+    def llr(self, wins, games):
+        return wins * self.win_llr + (games - wins) * self.loss_llr
+
+    def decision(self, wins, games):
+        """Return ``"H0"``, ``"H1"`` or ``None`` while undecided."""
+        llr = self.llr(wins, games)
+        if llr >= self.upper:
+            return "H1"
+        if llr <= self.lower:
+            return "H0"
+        return None
+
+
+class EarlyStop:
+    """
+    Stopping rule for a streamed evaluation: stop once every requested
+    interval half-width is within its margin, or once the SPRT decides.
+    Nothing is checked before ``min_games`` games.
+    """
+
+    def __init__(
+        self,
+        wp_margin=None,
+        adp_margin=None,
+        sprt=None,
+        confidence=0.95,
+        min_games=200,
+    ):
+        self.wp_margin = wp_margin
+        self.adp_margin = adp_margin
+        self.sprt = sprt
+        self.confidence = confidence
+        self.min_games = min_games
+        self.reason = None
+
+    def should_stop(self, stats):
+        if stats.num_games < self.min_games:
+            return False
+        if self.sprt is not None:
+            decision = self.sprt.decision(stats.num_landlord_wins, stats.num_games)
+            if decision is not None:
+                self.reason = "SPRT accepted {}".format(decision)
+                return True
+        margins = []
+        if self.wp_margin is not None:
+            lo, hi = stats.wp_interval(self.confidence)
+            margins.append((hi - lo) / 2 <= self.wp_margin)
+        if self.adp_margin is not None:
+            lo, hi = stats.adp_interval(self.confidence)
+            margins.append((hi - lo) / 2 <= self.adp_margin)
+        if margins and all(margins):
+            self.reason = "target margin reached"
+            return True
+        return False
+
+
+def _mean_var(value_counts):
+    n = sum(value_counts.values())
+    if n == 0:
+        return float("nan"), float("nan")
+    mean = sum(v * c for v, c in value_counts.items()) / n
+    var = sum(c * (v - mean) ** 2 for v, c in value_counts.items()) / max(n - 1, 1)
+    return mean, var
+
+
+class PairedStats:
+    """
+    Duplicate evaluation: every deal is played once with agent A as
+    landlord against B as farmers and once with the roles swapped. Per
+    deal we score A's landlord result minus B's landlord result on the
+    same cards, which cancels most of the deal luck.
+    """
+
+    def __init__(self):
+        self.plain = (OutcomeStats(), OutcomeStats())
+        self.wp_diff_counts = Counter()
+        self.score_diff_counts = Counter()
+
+    @property
+    def num_games(self):
+        return sum(self.wp_diff_counts.values())
+
+    def add(self, result_a, result_b):
+        self.plain[0].add(result_a)
+        self.plain[1].add(result_b)
+        self.wp_diff_counts[result_a.landlord_win - result_b.landlord_win] += 1
+        self.score_diff_counts[result_a.landlord_score - result_b.landlord_score] += 1
+
+    def wp_delta(self):
+        return _mean_var(self.wp_diff_counts)[0]
+
+    def adp_delta(self):
+        return _mean_var(self.score_diff_counts)[0]
+
+    def wp_interval(self, confidence=0.95):
+        return bootstrap_mean_interval(self.wp_diff_counts, confidence)
+
+    def adp_interval(self, confidence=0.95):
+        return bootstrap_mean_interval(self.score_diff_counts, confidence)
+
+    def variance_reduction(self):
+        """Unpaired over paired variance of the per-deal ADP difference."""
+        unpaired = sum(
+            _mean_var(stats.landlord_score_counts)[1] for stats in self.plain
+        )
+        paired = _mean_var(self.score_diff_counts)[1]
+        return unpaired / paired if paired > 0 else float("inf")
@@ -0,0 +1,145 @@
+"""
+Round-robin tournament: every agent plays the landlord seat against every
+agent in both farmer seats on the same deal set.
+
+A single pool of long-lived workers serves the whole matrix. Each worker
+memory-maps the deal file once and keeps every agent it has loaded, so a
+model is imported and read at most once per worker however many matchups
+it appears in.
+"""
+
+import json
+import multiprocessing as mp
+import os
+import time
+
+from .deal_file import DealFile, as_deal_file
+from .simulation import Table, _next_result, data_chunks
+from .stats import OutcomeStats
+
+
+def _matchup_seats(agent_specs, landlord_index, farmer_index):
+    return {
+        "landlord": agent_specs[landlord_index],
+        "landlord_up": agent_specs[farmer_index],
+        "landlord_down": agent_specs[farmer_index],
+    }
+
+
+def mp_tournament(task_queue, eval_data, agent_specs, q, lockstep_games=0):
+    """Worker loop for ``(landlord_index, farmer_index, deal_indices)`` tasks."""
+    deals = DealFile(eval_data)
+    cache = {}
+    tables = {}
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+        landlord_index, farmer_index, deal_indices = task
+        key = (landlord_index, farmer_index)
+        if key not in tables:
+            tables[key] = Table(
+                _matchup_seats(agent_specs, landlord_index, farmer_index),
+                lockstep_games,
+                cache,
+            )
+
+        start_time = time.perf_counter()
+        results = tables[key].play(list(zip(deal_indices, deals.take(deal_indices))))
+        q.put((key, results, time.perf_counter() - start_time))
+    q.put(None)
+
+
+def tournament(
+    agent_specs,
+    eval_data,
+    num_workers,
+    output=None,
+    lockstep_games=0,
+    chunk_size=100,
+    confidence=0.95,
+):
+    """
+    Play the full K x K landlord-vs-farmers matrix for ``agent_specs``
+    (anything ``load_card_play_models`` accepts) and return it as a dict.
+    Rows are the landlord agent, columns the agent in both farmer seats.
+    The matrix is also written to ``output`` as JSON when given.
+    """
+    num_agents = len(agent_specs)
+    stats = {
+        (i, j): OutcomeStats() for i in range(num_agents) for j in range(num_agents)
+    }
+
+    start_time = time.perf_counter()
+    ctx = mp.get_context("spawn")
+    task_queue = ctx.Queue()
+    q = ctx.Queue()
+
+    with as_deal_file(eval_data) as eval_data:
+        num_deals = len(DealFile(eval_data))
+        # Interleave the matchups so every cell fills in at the same pace.
+        for deal_indices in data_chunks(num_deals, chunk_size):
+            for key in stats:
+                task_queue.put(key + (deal_indices,))
+        for _ in range(num_workers):
+            task_queue.put(None)
+
+        processes = []
+        for _ in range(num_workers):
+            p = ctx.Process(
+                target=mp_tournament,
+                args=(task_queue, eval_data, agent_specs, q, lockstep_games),
+            )
+            p.start()
+            processes.append(p)
+
+        num_finished = 0
+        while num_finished < num_workers:
+            message = _next_result(q, processes)
+            if message is None:
+                num_finished += 1
+                continue
+            key, results, _ = message
+            for result in results:
+                stats[key].add(result)
+
+        for p in processes:
+            p.join()
+
+    def cell(key):
+        cell_stats = stats[key]
+        return {
+            "games": cell_stats.num_games,
+            "wp": cell_stats.num_landlord_wins / cell_stats.num_games,
+            "wp_ci": list(cell_stats.wp_interval(confidence)),
+            "adp": cell_stats.num_landlord_scores / cell_stats.num_games,
+            "adp_ci": list(cell_stats.adp_interval(confidence)),
+        }
+
+    matrix = {
+        "agents": list(agent_specs),
+        "rows": "landlord",
+        "columns": "farmers",
+        "confidence": confidence,
+        "num_deals": num_deals,
+        "wall_seconds": time.perf_counter() - start_time,
+        "cells": [[cell((i, j)) for j in range(num_agents)] for i in range(num_agents)],
+    }
+    if output is not None:
+        with open(output, "w") as f:
+            json.dump(matrix, f, indent=2)
+    return matrix
+
+
+def print_matrix(matrix):
+    names = [os.path.basename(spec) for spec in matrix["agents"]]
+    width = max(12, max(len(name) for name in names) + 2)
+    for metric in ["wp", "adp"]:
+        print("Landlord {} (rows: landlord, columns: farmers)".format(metric.upper()))
+        print("".ljust(width) + "".join(name.rjust(width) for name in names))
+        for name, row in zip(names, matrix["cells"]):
+            print(
+                name.ljust(width)
+                + "".join("{:.4f}".format(cell[metric]).rjust(width) for cell in row)
+            )
+        print()
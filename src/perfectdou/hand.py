@@ -0,0 +1,165 @@
+"""
+Immutable hands of env card values.
+
+``Hand`` wraps the ``perfectdou.cards`` key of a multiset of cards
+together with its size. Every ``Hand`` is part of one deck: no rank has
+more than four cards and there is at most one of each joker. Adding,
+subtracting and checking that a hand contains a move are a few integer
+operations on the keys rather than list edits, and hands are hashable,
+so they can key dicts and caches directly.
+
+Subtraction and containment rely on the digit sum of a key, its number
+of cards: ``a - b`` borrows across a slot exactly when ``b`` holds more
+cards of some rank than ``a``, and every borrow raises the digit sum of
+the difference by 7. Addition carries the same way.
+"""
+
+from perfectdou.cards import (
+    ENV_SLOT,
+    KEY_BITS,
+    NUM_SLOTS,
+    counts_key,
+    env_key,
+    key_counts,
+    key_env_cards,
+)
+
+_SLOT_MASK = (1 << KEY_BITS) - 1
+# Bit b of every slot, to count cards with three popcounts.
+_BIT0, _BIT1, _BIT2 = (
+    sum(1 << (KEY_BITS * slot + bit) for slot in range(NUM_SLOTS))
+    for bit in range(KEY_BITS)
+)
+DECK_KEY = counts_key([4] * (NUM_SLOTS - 2) + [1, 1])
+DECK_SIZE = 54
+
+
+def _num_cards(key):
+    """Digit sum of a non-negative key over the 15 slots."""
+    return (
+        bin(key & _BIT0).count("1")
+        + 2 * bin(key & _BIT1).count("1")
+        + 4 * bin(key & _BIT2).count("1")
+    )
+
+
+def _in_deck(key, size):
+    """Whether ``key`` holds ``size`` cards without going past one deck."""
+    rest = DECK_KEY - key
+    return (
+        rest >= 0 and _num_cards(key) == size and _num_cards(rest) == DECK_SIZE - size
+    )
+
+
+class Hand:
+    """
+    An immutable multiset of env card values, e.g. ``Hand([3, 3, 17])``.
+    Iterating gives the cards in ascending order, like the env's lists.
+    """
+
+    __slots__ = ("key", "size")
+
+    def __init__(self, cards=()):
+        cards = list(cards)
+        try:
+            key = env_key(cards)
+        except KeyError as e:
+            raise ValueError("Not an env card value: {!r}".format(e.args[0]))
+        if not _in_deck(key, len(cards)):
+            raise ValueError("Not part of one deck: {}".format(sorted(cards)))
+        _set_key(self, key)
+        _set_size(self, len(cards))
+
+    @classmethod
+    def _make(cls, key, size):
+        hand = object.__new__(cls)
+        _set_key(hand, key)
+        _set_size(hand, size)
+        return hand
+
+    @classmethod
+    def from_key(cls, key):
+        """The hand of a ``perfectdou.cards`` key."""
+        size = _num_cards(key) if key >= 0 else -1
+        if not _in_deck(key, size):
+            raise ValueError("Not the key of part of one deck: {}".format(key))
+        return cls._make(key, size)
+
+    @classmethod
+    def _coerce(cls, cards):
+        return cards if isinstance(cards, Hand) else cls(cards)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Hand is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("Hand is immutable")
+
+    def __reduce__(self):
+        return (Hand, (self.cards(),))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def cards(self):
+        """The cards as a new ascending list of env card values."""
+        return key_env_cards(self.key)
+
+    def counts(self):
+        """The 15 per-slot counts, as used by ``perfectdou.moves``."""
+        return key_counts(self.key)
+
+    def count(self, card):
+        """How many cards of env value ``card`` the hand holds."""
+        return (self.key >> (KEY_BITS * ENV_SLOT[card])) & _SLOT_MASK
+
+    def contains(self, move):
+        """Whether every card of ``move``, a ``Hand`` or env cards, is held."""
+        move = self._coerce(move)
+        rest = self.key - move.key
+        return rest >= 0 and _num_cards(rest) == self.size - move.size
+
+    def __add__(self, other):
+        other = self._coerce(other)
+        key = self.key + other.key
+        size = self.size + other.size
+        if not _in_deck(key, size):
+            raise ValueError("{!r} + {!r} is not part of one deck".format(self, other))
+        return self._make(key, size)
+
+    def __sub__(self, other):
+        other = self._coerce(other)
+        if not self.contains(other):
+            raise ValueError("{!r} does not contain {!r}".format(self, other))
+        return self._make(self.key - other.key, self.size - other.size)
+
+    def __contains__(self, card):
+        return card in ENV_SLOT and self.count(card) > 0
+
+    def __iter__(self):
+        return iter(self.cards())
+
+    def __len__(self):
+        return self.size
+
+    def __eq__(self, other):
+        if isinstance(other, Hand):
+            return self.key == other.key
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __repr__(self):
+        return "Hand({})".format(self.cards())
+
+
+# The slots' own setters, which bypass the immutable ``__setattr__``.
+_set_key = Hand.key.__set__
+_set_size = Hand.size.__set__
+
+DECK = Hand._make(DECK_KEY, DECK_SIZE)
+EMPTY = Hand._make(0, 0)
@@ -0,0 +1,104 @@
+"""
+Export DouZero LSTM checkpoints to ONNX for the onnxruntime agent.
+
+The exported graph takes the history of each decision once and the
+legal-action rows of every decision back to back, like ``predict``.
+Instead of ``num_actions`` it takes ``decision_index``, the decision
+each action row belongs to, which maps onto a plain ``Gather``:
+
+    z               float32 (decisions, 5, 162)
+    x               float32 (actions, 373 or 484)
+    decision_index  int64   (actions,)
+    values          float32 (actions, 1)
+
+All leading axes are dynamic, so a single game and a lockstep batch of
+games go through the same graph.
+"""
+
+import inspect
+
+import numpy as np
+import torch
+from torch import nn
+
+OPSET_VERSION = 11
+INPUT_NAMES = ["z", "x", "decision_index"]
+OUTPUT_NAMES = ["values"]
+
+
+class SharedHistoryValues(nn.Module):
+    """``predict`` of a DouZero model with a gather instead of a repeat."""
+
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+
+    def forward(self, z, x, decision_index):
+        model = self.model
+        lstm_out, _ = model.lstm(z)
+        lstm_out = lstm_out[:, -1, :].index_select(0, decision_index)
+        x = torch.cat([lstm_out, x], dim=-1)
+        for dense in [
+            model.dense1,
+            model.dense2,
+            model.dense3,
+            model.dense4,
+            model.dense5,
+        ]:
+            x = torch.relu(dense(x))
+        return model.dense6(x)
+
+
+def export_onnx(model, output_path):
+    """Write ``model`` (a loaded, eval-mode DouZero model) to ``output_path``."""
+    model = model.cpu().eval()
+    x_dim = model.dense1.in_features - model.lstm.hidden_size
+    example = (
+        torch.zeros(2, 5, model.lstm.input_size),
+        torch.zeros(3, x_dim),
+        torch.tensor([0, 0, 1]),
+    )
+    kwargs = {}
+    if "dynamo" in inspect.signature(torch.onnx.export).parameters:
+        # Newer torch defaults to the dynamo exporter; keep the tracing one.
+        kwargs["dynamo"] = False
+    torch.onnx.export(
+        SharedHistoryValues(model),
+        example,
+        output_path,
+        input_names=INPUT_NAMES,
+        output_names=OUTPUT_NAMES,
+        dynamic_axes={
+            "z": {0: "decisions"},
+            "x": {0: "actions"},
+            "decision_index": {0: "actions"},
+            "values": {0: "actions"},
+        },
+        opset_version=OPSET_VERSION,
+        **kwargs,
+    )
+
+
+def parity_check(model, session, observations):
+    """
+    Largest absolute difference between ``model.predict`` and the ONNX
+    ``session`` over recorded ``get_obs`` observations.
+    """
+    max_abs_diff = 0.0
+    for obs in observations:
+        z = obs["z"][np.newaxis].astype(np.float32)
+        x = obs["x_batch"].astype(np.float32)
+        with torch.no_grad():
+            expected = model.predict(torch.from_numpy(z), torch.from_numpy(x))
+        values = session.run(
+            OUTPUT_NAMES,
+            {
+                "z": z,
+                "x": x,
+                "decision_index": np.zeros(len(x), dtype=np.int64),
+            },
+        )[0]
+        max_abs_diff = max(
+            max_abs_diff, float(np.abs(values - expected.cpu().numpy()).max())
+        )
+    return max_abs_diff
@@ -43,6 +43,33 @@ class LandlordLstmModel(nn.Module):
                 action = torch.argmax(x,dim=0)[0]
             return dict(action=action)
 
+    def predict(self, z, x, num_actions=None):
+        """
+        Inference-only values. ``z`` holds one history per decision
+        (D, T, 162) instead of one per legal action, and ``x`` holds the
+        action rows of all decisions back to back. ``num_actions`` gives
+        the rows per decision; it may be omitted when D == 1.
+        """
+        lstm_out, (h_n, _) = self.lstm(z)
+        lstm_out = lstm_out[:,-1,:]
+        if num_actions is None:
+            lstm_out = lstm_out.expand(x.shape[0], -1)
+        else:
+            lstm_out = torch.repeat_interleave(lstm_out, num_actions, dim=0)
+        x = torch.cat([lstm_out,x], dim=-1)
+        x = self.dense1(x)
+        x = torch.relu(x)
+        x = self.dense2(x)
+        x = torch.relu(x)
+        x = self.dense3(x)
+        x = torch.relu(x)
+        x = self.dense4(x)
+        x = torch.relu(x)
+        x = self.dense5(x)
+        x = torch.relu(x)
+        x = self.dense6(x)
+        return x
+
 class FarmerLstmModel(nn.Module):
     def __init__(self):
         super().__init__()
@@ -78,6 +105,33 @@ class FarmerLstmModel(nn.Module):
                 action = torch.argmax(x,dim=0)[0]
             return dict(action=action)
 
+    def predict(self, z, x, num_actions=None):
+        """
+        Inference-only values. ``z`` holds one history per decision
+        (D, T, 162) instead of one per legal action, and ``x`` holds the
+        action rows of all decisions back to back. ``num_actions`` gives
+        the rows per decision; it may be omitted when D == 1.
+        """
+        lstm_out, (h_n, _) = self.lstm(z)
+        lstm_out = lstm_out[:,-1,:]
+        if num_actions is None:
+            lstm_out = lstm_out.expand(x.shape[0], -1)
+        else:
+            lstm_out = torch.repeat_interleave(lstm_out, num_actions, dim=0)
+        x = torch.cat([lstm_out,x], dim=-1)
+        x = self.dense1(x)
+        x = torch.relu(x)
+        x = self.dense2(x)
+        x = torch.relu(x)
+        x = self.dense3(x)
+        x = torch.relu(x)
+        x = self.dense4(x)
+        x = torch.relu(x)
+        x = self.dense5(x)
+        x = torch.relu(x)
+        x = self.dense6(x)
+        return x
+
 # Model dict is only used in evaluation but not training
 model_dict = {}
 model_dict['landlord'] = LandlordLstmModel
@@ -0,0 +1,25 @@
+"""
+Dynamic INT8 quantization of ONNX policy graphs.
+
+Only the dense layers (``MatMul``/``Gemm``) are quantized: their weights
+are stored as int8 and activations are quantized on the fly, so no
+calibration data is needed. Everything else stays in fp32.
+"""
+
+import os
+
+from onnxruntime.quantization import QuantType, quantize_dynamic
+
+DENSE_OP_TYPES = ["MatMul", "Gemm"]
+
+
+def quantize_model(input_path, output_path, per_channel=False):
+    """Write an INT8 copy of ``input_path`` and return both file sizes."""
+    quantize_dynamic(
+        input_path,
+        output_path,
+        op_types_to_quantize=DENSE_OP_TYPES,
+        per_channel=per_channel,
+        weight_type=QuantType.QInt8,
+    )
+    return os.path.getsize(input_path), os.path.getsize(output_path)
@@ -0,0 +1,262 @@
+"""
+Legal move generation on count vectors.
+
+Moves follow the rules behind RLCard's ``card_type.json``: every move
+listed there is a legal lead, and a follow must have the same type and a
+higher rank there, or be a bomb or the rocket. A hand is given as its 15
+per-slot counts and moves come back as ``perfectdou.cards`` keys, so
+duplicates (the same cards reached as different combinations) collapse
+for free.
+
+Chains are found with per-multiplicity run lengths: ``runs[m][slot]``
+is how many consecutive slots from ``slot`` hold at least ``m`` cards,
+so a chain of ``length`` fits at ``slot`` iff ``runs[m][slot] >= length``.
+The cards of every chain are precomputed in ``CHAIN_KEYS``.
+"""
+
+import itertools
+
+from perfectdou.cards import (
+    KEY_BITS,
+    NUM_CHAIN_SLOTS,
+    NUM_SLOTS,
+    RANK_SLOT,
+    env_key,
+    key_counts,
+)
+
+BLACK_JOKER = RANK_SLOT["B"]
+RED_JOKER = RANK_SLOT["R"]
+TWO = RANK_SLOT["2"]
+
+# (multiplicity, shortest chain, longest chain); no chain exceeds 20 cards.
+CHAINS = ((1, 5, 12), (2, 3, 10), (3, 2, 6))
+# Trio chains that carry one kicker per trio: (kicker size, longest chain).
+KICKED_CHAINS = ((1, 5), (2, 4))
+
+_UNIT = [1 << (KEY_BITS * slot) for slot in range(NUM_SLOTS)]
+ROCKET_KEY = _UNIT[BLACK_JOKER] + _UNIT[RED_JOKER]
+
+# CHAIN_KEYS[m][start][length]: key of ``m`` cards of each rank in the run.
+CHAIN_KEYS = {
+    multiplicity: [
+        [
+            multiplicity * sum(_UNIT[start : start + length])
+            for length in range(NUM_CHAIN_SLOTS - start + 1)
+        ]
+        for start in range(NUM_CHAIN_SLOTS)
+    ]
+    for multiplicity in (1, 2, 3)
+}
+
+
+def hand_counts(cards):
+    """Per-slot counts of a hand given as env card values."""
+    return key_counts(env_key(cards))
+
+
+def _runs(counts, multiplicity):
+    runs = [0] * (NUM_CHAIN_SLOTS + 1)
+    for slot in range(NUM_CHAIN_SLOTS - 1, -1, -1):
+        if counts[slot] >= multiplicity:
+            runs[slot] = runs[slot + 1] + 1
+    return runs
+
+
+def _chains(counts, multiplicity, shortest, longest):
+    """(start, length) of every chain of ``multiplicity`` cards a rank."""
+    runs = _runs(counts, multiplicity)
+    return [
+        (start, length)
+        for start in range(NUM_CHAIN_SLOTS)
+        for length in range(shortest, min(runs[start], longest) + 1)
+    ]
+
+
+def _kickers(counts, excluded, size, number, adjacent=()):
+    """
+    Keys of every way to add ``number`` kickers of ``size`` cards. Solo
+    kickers may repeat a rank up to a trio, except a trio in a slot of
+    ``adjacent`` that would just lengthen the chain, and never hold both
+    jokers; pair kickers are distinct ranks below the jokers. No kicker
+    shares a rank with the cards they are attached to.
+    """
+    slots = [
+        slot
+        for slot in range(NUM_SLOTS if size == 1 else BLACK_JOKER)
+        if slot not in excluded and counts[slot] >= size
+    ]
+    if size == 2:
+        return [
+            2 * sum(_UNIT[slot] for slot in combo)
+            for combo in itertools.combinations(slots, number)
+        ]
+    # Per rank, the (key, cards) it can add; the two jokers share one
+    # choice of a single card between them.
+    choices = []
+    for slot in slots:
+        if slot == RED_JOKER and BLACK_JOKER in slots:
+            choices[-1].append((_UNIT[RED_JOKER], 1))
+            continue
+        cap = min(counts[slot], 2 if slot in adjacent else 3)
+        choices.append([(repeat * _UNIT[slot], repeat) for repeat in range(1, cap + 1)])
+    keys = []
+
+    def extend(first, key, left):
+        for index in range(first, len(choices)):
+            for add, cards in choices[index]:
+                if cards > left:
+                    break
+                if cards == left:
+                    keys.append(key + add)
+                else:
+                    extend(index + 1, key + add, left - cards)
+
+    extend(0, 0, number)
+    return keys
+
+
+def _singles(counts, multiplicity):
+    return [
+        multiplicity * _UNIT[slot]
+        for slot in range(NUM_SLOTS)
+        if counts[slot] >= multiplicity
+    ]
+
+
+def solo_moves(counts):
+    return _singles(counts, 1)
+
+
+def pair_moves(counts):
+    return _singles(counts, 2)
+
+
+def trio_moves(counts):
+    return _singles(counts, 3)
+
+
+def bomb_moves(counts):
+    return _singles(counts, 4)
+
+
+def rocket_moves(counts):
+    if counts[BLACK_JOKER] and counts[RED_JOKER]:
+        return [ROCKET_KEY]
+    return []
+
+
+def chain_moves(counts, multiplicity, lengths=None):
+    """Solo, pair or trio chains, optionally only of the given lengths."""
+    _, shortest, longest = CHAINS[multiplicity - 1]
+    keys = CHAIN_KEYS[multiplicity]
+    return [
+        keys[start][length]
+        for start, length in _chains(counts, multiplicity, shortest, longest)
+        if lengths is None or length in lengths
+    ]
+
+
+def trio_kicker_moves(counts, size, lengths=None):
+    """
+    A trio or trio chain with one kicker of ``size`` cards per trio;
+    length 1 is the plain trio with a solo or a pair.
+    """
+    longest = KICKED_CHAINS[size - 1][1]
+    runs = _runs(counts, 3)
+    moves = []
+    for start in range(NUM_SLOTS):
+        if counts[start] < 3:
+            continue
+        # A single trio may be of 2s; chains stop below them.
+        run = runs[start] if start < NUM_CHAIN_SLOTS else 1
+        for length in range(1, min(run, longest) + 1):
+            if lengths is not None and length not in lengths:
+                continue
+            chain = CHAIN_KEYS[3][start][length] if length > 1 else 3 * _UNIT[start]
+            excluded = range(start, start + length)
+            # 2s never extend a chain, so a trio of them is a fine kicker.
+            adjacent = (start - 1, start + length if start + length < TWO else -1)
+            for kickers in _kickers(counts, excluded, size, length, adjacent):
+                moves.append(chain + kickers)
+    return moves
+
+
+def four_kicker_moves(counts, size):
+    """Four of a rank with two kickers of ``size`` cards."""
+    moves = []
+    for slot in range(TWO + 1):
+        if counts[slot] == 4:
+            four = 4 * _UNIT[slot]
+            for kickers in _kickers(counts, (slot,), size, 2):
+                moves.append(four + kickers)
+    return moves
+
+
+def _unique(keys):
+    return list(dict.fromkeys(keys))
+
+
+def lead_moves(counts):
+    """Keys of every move that can lead from a hand with ``counts``."""
+    return _unique(
+        solo_moves(counts)
+        + pair_moves(counts)
+        + trio_moves(counts)
+        + trio_kicker_moves(counts, 1)
+        + trio_kicker_moves(counts, 2)
+        + chain_moves(counts, 1)
+        + chain_moves(counts, 2)
+        + chain_moves(counts, 3)
+        + four_kicker_moves(counts, 1)
+        + four_kicker_moves(counts, 2)
+        + bomb_moves(counts)
+        + rocket_moves(counts)
+    )
+
+
+def _candidates(counts, type_name):
+    """Moves that can have ``type_name``; a superset, filtered by the caller."""
+    family, _, length = type_name.rpartition("_")
+    if not length.isdigit():
+        family, length = type_name, None
+    lengths = None if length is None else (int(length),)
+    if family in ("solo", "pair", "trio", "bomb"):
+        return _singles(counts, ("solo", "pair", "trio", "bomb").index(family) + 1)
+    if family in ("solo_chain", "pair_chain", "trio_chain"):
+        multiplicity = ("solo_chain", "pair_chain", "trio_chain").index(family) + 1
+        return chain_moves(counts, multiplicity, lengths)
+    if family in ("trio_solo", "trio_solo_chain"):
+        return trio_kicker_moves(counts, 1, lengths or (1,))
+    if family in ("trio_pair", "trio_pair_chain"):
+        return trio_kicker_moves(counts, 2, lengths or (1,))
+    if family == "four_two_solo":
+        return four_kicker_moves(counts, 1)
+    if family == "four_two_pair":
+        return four_kicker_moves(counts, 2)
+    return []
+
+
+def follow_moves(counts, last_key, card_types=None):
+    """
+    Keys of every move that beats ``last_key`` from a hand with
+    ``counts``, not counting the pass.
+    """
+    if card_types is None:
+        from perfectdou.evaluation.card_types import card_type_table
+
+        card_types = card_type_table()
+    types = card_types.types
+    last_type, last_rank = types[last_key]
+    type_name = card_types.type_names[last_type]
+    if type_name == "rocket":
+        return []
+    moves = []
+    for key in _candidates(counts, type_name):
+        move_type, move_rank = types.get(key, (None, None))
+        if move_type == last_type and move_rank > last_rank:
+            moves.append(key)
+    if type_name != "bomb":
+        moves.extend(bomb_moves(counts))
+    moves.extend(rocket_moves(counts))
+    return _unique(moves)
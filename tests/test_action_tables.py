@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+动作表测试脚本
+
+NumPy 动作表的编码、解码和合法动作掩码必须与直接查询 JSON 字典的结果一致。
+"""
+
+import sys
+import os
+import json
+import random
+
+import numpy as np
+
+# 添加项目路径
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from perfectdou.action_tables import (
+    DEFAULT_PATH, action_key, compile_action_tables, load_action_tables)
+from perfectdou.cards import RANK_TO_ENV
+
+
+def _load_json(name):
+    with open(os.path.join(ROOT, name)) as f:
+        return json.load(f)
+
+
+def test_encode_decode():
+    """测试动作编号和牌型取值与 JSON 一致"""
+    tables = load_action_tables()
+    action_space = _load_json('action_space.json')
+    action_values = _load_json('action_values.json')
+    ids = tables.encode([action_key(action) for action in action_space])
+    assert ids.tolist() == list(action_space.values())
+    assert tables.decode(ids) == list(action_space)
+    for action, action_id in action_space.items():
+        assert tables.action_values[action_id].tolist() == action_values[action]
+    assert tables.encode([action_key('2222BR')]).tolist() == [-1]
+    assert tables.mask([action_key('pass')]).nonzero()[0].tolist() == [action_space['pass']]
+
+
+def test_legal_action_mask():
+    """测试合法动作的编号和掩码与逐个查询 specific_map 的结果一致"""
+    tables = load_action_tables()
+    action_space = _load_json('action_space.json')
+    specific_map = _load_json('specific_map.json')
+    moves = list(specific_map)
+    env_moves = [[] if move == 'pass' else [RANK_TO_ENV[rank] for rank in move]
+                 for move in moves]
+    expected_ids = [action_space[specific_map[move][0]] for move in moves]
+    assert tables.legal_action_ids(env_moves).tolist() == expected_ids
+
+    rng = random.Random(0)
+    for _ in range(200):
+        sample = rng.sample(range(len(moves)), rng.randint(1, 60))
+        expected = np.zeros(tables.num_actions, dtype=bool)
+        for i in sample:
+            for action in specific_map[moves[i]]:
+                expected[action_space[action]] = True
+        mask = tables.legal_action_mask([env_moves[i] for i in sample])
+        assert (mask == expected).all()
+
+
+def test_action_tables_are_up_to_date(tmp_path):
+    """测试随包发布的动作表与重新编译的结果逐字节相同"""
+    output = str(tmp_path / 'action_tables.npz')
+    compile_action_tables(os.path.join(ROOT, 'action_space.json'),
+                          os.path.join(ROOT, 'action_values.json'),
+                          output)
+    with open(output, 'rb') as f, open(DEFAULT_PATH, 'rb') as shipped:
+        assert f.read() == shipped.read()
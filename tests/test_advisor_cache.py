@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+AI 建议缓存测试脚本
+
+AIAdvisor 按局面指纹缓存建议：同一局面直接命中，出牌或重置后的局面不会取到旧建议。
+"""
+
+import sys
+import os
+
+# 添加项目路径
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from perfectdou.battle_assistant import AIAdvisor, GameState, Position
+
+USER_CARDS = [3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 14, 17, 17, 20, 30]
+
+
+def _new_game():
+    state = GameState(Position.LANDLORD)
+    assert state.set_initial_cards(USER_CARDS, [5, 6, 7])
+    return state
+
+
+def test_cache_hits_same_situation():
+    """测试同一局面命中缓存，且修改返回值不影响缓存"""
+    advisor = AIAdvisor()
+    state = _new_game()
+    first = advisor.get_move_advice(state)
+    assert advisor.cache_stats() == {"hits": 0, "misses": 1, "size": 1, "maxsize": 256}
+    first[0].cards.append(99)
+    second = advisor.get_move_advice(state)
+    assert advisor.cache_stats()["hits"] == 1
+    assert 99 not in second[0].cards
+    # 建议数量不同是不同的缓存项
+    advisor.get_move_advice(state, num_suggestions=1)
+    assert advisor.cache_stats()["misses"] == 2
+
+
+def test_cache_invalidated_by_moves_and_reset():
+    """测试出牌、重置后指纹改变，不会取到旧局面的建议"""
+    advisor = AIAdvisor()
+    state = _new_game()
+    fingerprints = {state.fingerprint()}
+    advisor.get_move_advice(state)
+    for position, cards in ((Position.LANDLORD, [3]), (Position.LANDLORD_UP, []),
+                            (Position.LANDLORD_DOWN, [])):
+        assert state.make_move(position, cards)
+        fingerprints.add(state.fingerprint())
+    assert len(fingerprints) == 4
+    advice = advisor.get_move_advice(state)
+    assert advisor.cache_stats()["hits"] == 0
+    assert all(state.get_user_hand().contains(a.cards) for a in advice)
+
+    state.reset_game()
+    assert state.fingerprint() not in fingerprints
+    assert advisor.get_move_advice(state) == []
+    assert state.set_initial_cards(USER_CARDS, [5, 6, 7])
+    advisor.get_move_advice(state)
+    # 重新开局后回到完全相同的局面，可以复用建议
+    assert advisor.cache_stats()["hits"] == 1
+
+
+def test_cache_is_bounded_lru():
+    """测试缓存按最近使用淘汰，cache_size=0 时不缓存"""
+    advisor = AIAdvisor(cache_size=2)
+    states = [_new_game()]
+    for cards in ([3], [4]):
+        state = _new_game()
+        assert state.make_move(Position.LANDLORD, cards)
+        states.append(state)
+    for state in states:
+        advisor.get_move_advice(state)
+    assert advisor.cache_stats()["size"] == 2
+    advisor.get_move_advice(states[0])
+    assert advisor.cache_stats()["hits"] == 0
+    advisor.get_move_advice(states[2])
+    assert advisor.cache_stats()["hits"] == 1
+    advisor.clear_cache()
+    assert advisor.cache_stats() == {"hits": 0, "misses": 0, "size": 0, "maxsize": 2}
+
+    uncached = AIAdvisor(cache_size=0)
+    uncached.get_move_advice(states[0])
+    uncached.get_move_advice(states[0])
+    assert uncached.cache_stats() == {"hits": 0, "misses": 0, "size": 0, "maxsize": 0}
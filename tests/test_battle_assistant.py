@@ -115,6 +115,20 @@ def test_ai_advisor():
     print("✅ AI顾问测试完成\n")
 
 
+def test_ai_advisor_follow_infoset(capsys):
+    """测试跟牌时智能体拿到要压过的出牌，而不是走首出分支出错"""
+    game_state = GameState(Position.LANDLORD_UP)
+    game_state.set_initial_cards([3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 14, 17, 17, 20, 30])
+    game_state.make_move(Position.LANDLORD, [3])
+    
+    advice_list = AIAdvisor().get_move_advice(game_state, num_suggestions=3)
+    
+    assert "出错" not in capsys.readouterr().out
+    assert advice_list and advice_list[0].reasoning == "AI智能体推荐"
+    # RLCard 规则用最小的同型牌跟牌
+    assert advice_list[0].cards == [4]
+
+
 def main():
     """主测试函数"""
     print("🔬 PerfectDou 实战助手功能测试")
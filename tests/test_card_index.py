@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+牌型索引测试脚本
+
+编译后的 card_index.bin 必须与仓库根目录的 card_type.json、specific_map.json 内容一致。
+"""
+
+import sys
+import os
+import json
+
+# 添加项目路径
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from perfectdou.card_index import DEFAULT_PATH, CardIndex, compile_card_index
+
+
+def _load_json(name):
+    with open(os.path.join(ROOT, name)) as f:
+        return json.load(f)
+
+
+def test_card_index_matches_json():
+    """测试索引的查询结果与 JSON 完全一致"""
+    index = CardIndex()
+    card_type = _load_json('card_type.json')
+    specific_map = _load_json('specific_map.json')
+    assert dict(index.card_type) == card_type
+    assert dict(index.specific_map) == specific_map
+    assert 'pass' not in index.card_type
+    assert 'pass' in index.specific_map
+    assert index.card_type.get('2BR') is None
+
+
+def test_card_index_is_up_to_date(tmp_path):
+    """测试随包发布的索引与重新编译的结果逐字节相同"""
+    output = str(tmp_path / 'card_index.bin')
+    compile_card_index(os.path.join(ROOT, 'card_type.json'),
+                       os.path.join(ROOT, 'specific_map.json'),
+                       output)
+    with open(output, 'rb') as f, open(DEFAULT_PATH, 'rb') as shipped:
+        assert f.read() == shipped.read()
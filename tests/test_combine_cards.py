@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+牌型组合测试脚本
+
+基于计数向量的 combine_cards 必须与原先基于字符串的实现给出完全相同的拆分。
+"""
+
+import sys
+import os
+import itertools
+import random
+
+# 添加项目路径
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from perfectdou.cards import RANKS
+from perfectdou.evaluation.rlcard_agent import INDEX, combine_cards
+
+
+def legacy_card_str2list(hand):
+    hand_list = [0 for _ in range(15)]
+    for card in hand:
+        hand_list[INDEX[card]] += 1
+    return hand_list
+
+
+def legacy_list2card_str(hand_list):
+    card_str = ""
+    cards = [card for card in INDEX]
+    for index, count in enumerate(hand_list):
+        card_str += cards[index] * count
+    return card_str
+
+
+def legacy_pick_chain(hand_list, count):
+    chains = []
+    str_card = [card for card in INDEX]
+    hand_list = [str(card) for card in hand_list]
+    hand = "".join(hand_list[:12])
+    chain_list = hand.split("0")
+    add = 0
+    for index, chain in enumerate(chain_list):
+        if len(chain) > 0:
+            if len(chain) >= 5:
+                start = index + add
+                min_count = int(min(chain)) // count
+                if min_count != 0:
+                    str_chain = ""
+                    for num in range(len(chain)):
+                        str_chain += str_card[start + num]
+                        hand_list[start + num] = int(hand_list[start + num]) - int(
+                            min(chain)
+                        )
+                    for _ in range(min_count):
+                        chains.append(str_chain)
+            add += len(chain)
+    hand_list = [int(card) for card in hand_list]
+    return (chains, hand_list)
+
+
+def legacy_combine_cards(hand):
+    """原先基于字符串的 combine_cards"""
+    comb = {
+        "rocket": [],
+        "bomb": [],
+        "trio": [],
+        "trio_chain": [],
+        "solo_chain": [],
+        "pair_chain": [],
+        "pair": [],
+        "solo": [],
+    }
+    # 1. pick rocket
+    if hand[-2:] == "BR":
+        comb["rocket"].append("BR")
+        hand = hand[:-2]
+    # 2. pick bomb
+    hand_cp = hand
+    for index in range(len(hand_cp) - 3):
+        if hand_cp[index] == hand_cp[index + 3]:
+            bomb = hand_cp[index : index + 4]
+            comb["bomb"].append(bomb)
+            hand = hand.replace(bomb, "")
+    # 3. pick trio and trio_chain
+    hand_cp = hand
+    for index in range(len(hand_cp) - 2):
+        if hand_cp[index] == hand_cp[index + 2]:
+            trio = hand_cp[index : index + 3]
+            if (
+                len(comb["trio"]) > 0
+                and INDEX[trio[-1]] < 12
+                and (INDEX[trio[-1]] - 1) == INDEX[comb["trio"][-1][-1]]
+            ):
+                comb["trio"][-1] += trio
+            else:
+                comb["trio"].append(trio)
+            hand = hand.replace(trio, "")
+    only_trio = []
+    only_trio_chain = []
+    for trio in comb["trio"]:
+        if len(trio) == 3:
+            only_trio.append(trio)
+        else:
+            only_trio_chain.append(trio)
+    comb["trio"] = only_trio
+    comb["trio_chain"] = only_trio_chain
+    # 4. pick solo chain
+    hand_list = legacy_card_str2list(hand)
+    chains, hand_list = legacy_pick_chain(hand_list, 1)
+    comb["solo_chain"] = chains
+    # 5. pick par_chain
+    chains, hand_list = legacy_pick_chain(hand_list, 2)
+    comb["pair_chain"] = chains
+    hand = legacy_list2card_str(hand_list)
+    # 6. pick pair and solo
+    index = 0
+    while index < len(hand) - 1:
+        if hand[index] == hand[index + 1]:
+            comb["pair"].append(hand[index] + hand[index + 1])
+            index += 2
+        else:
+            comb["solo"].append(hand[index])
+            index += 1
+    if index == (len(hand) - 1):
+        comb["solo"].append(hand[index])
+    return comb
+
+
+def _hand(counts):
+    return "".join(rank * count for rank, count in zip(RANKS, counts))
+
+
+def _check(hand):
+    assert combine_cards(hand) == legacy_combine_cards(hand), hand
+
+
+def test_combine_cards_chain_ranks():
+    """测试 3 到 A 中任意连续 5 个点数各 0-4 张的所有手牌"""
+    for low in range(8):
+        for counts in itertools.product(range(5), repeat=5):
+            hand_counts = [0] * 15
+            hand_counts[low:low + 5] = counts
+            _check(_hand(hand_counts))
+
+
+def test_combine_cards_sampled_hands():
+    """测试随机抽取的各种张数的手牌"""
+    deck = [rank for rank in RANKS[:13] for _ in range(4)] + ["B", "R"]
+    rng = random.Random(0)
+    for _ in range(20000):
+        cards = rng.sample(deck, rng.randint(1, 20))
+        _check("".join(sorted(cards, key=INDEX.get)))
+
+
+def test_combine_cards_copies_memo():
+    """测试修改返回结果不会影响缓存"""
+    hand = "33345678"
+    comb = combine_cards(hand)
+    comb["trio"].append("444")
+    assert combine_cards(hand) == legacy_combine_cards(hand)
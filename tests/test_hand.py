@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Hand 测试脚本
+
+基于计数向量的 Hand 在加减和包含判断上必须与列表实现一致。
+"""
+
+import sys
+import os
+import pickle
+import random
+
+import pytest
+
+# 添加项目路径
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from perfectdou.cards import ENV_CARDS
+from perfectdou.hand import DECK, EMPTY, Hand
+from perfectdou.battle_assistant.game_state import GameState, Position
+
+DECK_CARDS = [card for card in ENV_CARDS[:13] for _ in range(4)] + [20, 30]
+
+
+def _list_contains(cards, move):
+    return all(cards.count(card) >= move.count(card) for card in set(move))
+
+
+def _list_subtract(cards, move):
+    rest = list(cards)
+    for card in move:
+        rest.remove(card)
+    return sorted(rest)
+
+
+def test_hand_matches_lists():
+    """测试随机手牌的包含、减法、加法与列表实现一致"""
+    rng = random.Random(3)
+    for _ in range(5000):
+        cards = rng.sample(DECK_CARDS, rng.randint(0, 20))
+        move = rng.sample(DECK_CARDS, rng.randint(0, 6))
+        hand = Hand(cards)
+        assert hand.cards() == sorted(cards) == list(hand)
+        assert len(hand) == len(cards)
+        assert hand.contains(move) == _list_contains(cards, move)
+        if _list_contains(cards, move):
+            assert (hand - move).cards() == _list_subtract(cards, move)
+        else:
+            with pytest.raises(ValueError):
+                hand - move
+        other = rng.sample(DECK_CARDS, rng.randint(0, 20))
+        if _list_contains(DECK_CARDS, cards + other):
+            assert (hand + other).cards() == sorted(cards + other)
+        else:
+            with pytest.raises(ValueError):
+                hand + other
+
+
+def test_hand_value_semantics():
+    """测试 Hand 不可变、可哈希、可序列化，且只能是一副牌的一部分"""
+    hand = Hand([17, 3, 3])
+    assert hand == Hand([3, 3, 17]) and hash(hand) == hash(Hand([3, 17, 3]))
+    assert {hand: 1}[Hand([3, 17, 3])] == 1
+    assert pickle.loads(pickle.dumps(hand)) == hand
+    assert hand.count(3) == 2 and 17 in hand and 4 not in hand
+    assert Hand.from_key(hand.key) == hand
+    assert Hand(DECK_CARDS) == DECK and DECK - DECK == EMPTY == Hand()
+    with pytest.raises(AttributeError):
+        hand.key = 0
+    for cards in ([3] * 5, [3] * 8, [20, 20], [30] * 8, [99]):
+        with pytest.raises(ValueError):
+            Hand(cards)
+
+
+def test_game_state_uses_hand():
+    """测试 GameState 出牌时整手校验，没有的牌不会被部分扣除"""
+    state = GameState(Position.LANDLORD)
+    assert state.set_initial_cards([3, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 17, 17, 20, 30],
+                                   [3, 4, 5])
+    hand = state.get_user_hand()
+    assert len(hand) == 20 and state.players[Position.LANDLORD].remaining_count == 20
+    assert not state.make_move(Position.LANDLORD, [3, 3, 3, 3])
+    assert state.get_user_hand() == hand
+    assert state.make_move(Position.LANDLORD, [3, 3, 3])
+    assert state.get_user_hand() == hand - [3, 3, 3]
+    assert state.get_user_hand_cards() == (hand - [3, 3, 3]).cards()
+    assert not state.card_parser.validate_cards([20, 20])
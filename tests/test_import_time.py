@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+启动耗时测试脚本
+
+用 ``python -X importtime`` 统计实战助手入口的导入耗时，超过预算或加载了
+torch、onnxruntime 等重型依赖时测试失败。
+"""
+
+import sys
+import os
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 导入耗时预算（毫秒），远高于正常值，只用来发现误引入的重型依赖
+CARD_PARSER_BUDGET_MS = 100
+BATTLE_HELP_BUDGET_MS = 150
+HEAVY_MODULES = {'torch', 'onnxruntime', 'rlcard', 'numpy', 'perfectdou.evaluation'}
+
+
+def import_time(*args):
+    """运行 ``python -X importtime *args``，返回 (导入总耗时毫秒, 导入的模块)"""
+    env = dict(os.environ, PYTHONPATH=os.path.join(ROOT, 'src'))
+    result = subprocess.run([sys.executable, '-X', 'importtime'] + list(args),
+                            env=env, stdout=subprocess.DEVNULL,
+                            stderr=subprocess.PIPE, universal_newlines=True,
+                            check=True)
+    total_us = 0
+    modules = set()
+    after_startup = False
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        modules.add(name.strip())
+        # 顶层条目的累计耗时之和即为全部导入耗时，解释器自身启动（site）之前的不计
+        if name.startswith(' ') and not name.startswith('  '):
+            if after_startup:
+                total_us += int(cumulative)
+            elif name.strip() == 'site':
+                after_startup = True
+    return total_us / 1000, modules
+
+
+def _heavy(modules):
+    return {name for name in modules
+            if any(name == heavy or name.startswith(heavy + '.')
+                   for heavy in HEAVY_MODULES)}
+
+
+def test_card_parser_import_time():
+    """测试只导入牌型解析器时的耗时"""
+    elapsed_ms, modules = import_time(
+        '-c', 'from perfectdou.battle_assistant import CardParser')
+    assert not _heavy(modules)
+    assert 'perfectdou.battle_assistant.ai_advisor' not in modules
+    assert elapsed_ms < CARD_PARSER_BUDGET_MS, elapsed_ms
+
+
+def test_battle_help_import_time():
+    """测试 battle --help 的导入耗时"""
+    elapsed_ms, modules = import_time('-m', 'perfectdou.cli.battle_assistant', '--help')
+    assert not _heavy(modules)
+    assert 'perfectdou.battle_assistant' not in modules
+    assert elapsed_ms < BATTLE_HELP_BUDGET_MS, elapsed_ms
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+智能体加载测试脚本
+
+只有 perfectdou_<变体名> 才是内置模型的变体，以 perfectdou_ 开头的检查点路径仍按路径加载。
+"""
+
+import sys
+import os
+
+import pytest
+
+# 添加项目路径
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+pytest.importorskip("perfectdou.env.game")
+
+from perfectdou.evaluation.simulation import _bundled_variant
+
+
+def test_bundled_variant(tmp_path, monkeypatch):
+    """测试变体名的识别，路径和已存在的文件不会被当作变体"""
+    assert _bundled_variant("perfectdou_int8") == "int8"
+    assert _bundled_variant("perfectdou_int8_v2") == "int8_v2"
+    assert _bundled_variant("perfectdou") is None
+    assert _bundled_variant("perfectdou_") is None
+    assert _bundled_variant("perfectdou_ckpts/landlord.ckpt") is None
+    assert _bundled_variant("perfectdou_landlord.onnx") is None
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "perfectdou_ckpts").mkdir()
+    assert _bundled_variant("perfectdou_ckpts") is None
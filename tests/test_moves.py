@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+出牌生成测试脚本
+
+基于计数向量的出牌生成必须与 card_type.json 中的牌型规则完全一致。
+"""
+
+import sys
+import os
+import json
+import random
+
+# 添加项目路径
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from perfectdou.cards import ENV_CARDS, env_key, key_counts, key_env_cards, rank_key
+from perfectdou.evaluation.card_types import card_type_table
+from perfectdou.moves import follow_moves, hand_counts, lead_moves
+
+DECK = [card for card in ENV_CARDS[:13] for _ in range(4)] + [20, 30]
+
+
+def _contained(key, counts):
+    return all(need <= have for need, have in zip(key_counts(key), counts))
+
+
+def _random_hands(num_hands, seed):
+    rng = random.Random(seed)
+    return [hand_counts(rng.sample(DECK, rng.randint(1, 20)))
+            for _ in range(num_hands)]
+
+
+def test_full_deck_leads_every_move():
+    """测试整副牌能首出的牌型恰好是 card_type.json 中的全部牌型"""
+    with open(os.path.join(ROOT, 'card_type.json')) as f:
+        expected = {rank_key(cards) for cards in json.load(f)}
+    moves = lead_moves(hand_counts(DECK))
+    assert len(moves) == len(set(moves))
+    assert set(moves) == expected
+
+
+def test_lead_moves_random_hands():
+    """测试随机手牌的首出集合与逐个检查牌型表的结果一致"""
+    keys = list(card_type_table().types)
+    for counts in _random_hands(30, seed=0):
+        assert set(lead_moves(counts)) == {key for key in keys if _contained(key, counts)}
+
+
+def test_follow_moves_random_hands():
+    """测试随机手牌的跟牌集合：同牌型更大的牌，或炸弹、王炸"""
+    card_types = card_type_table()
+    type_id = {name: i for i, name in enumerate(card_types.type_names)}
+    keys = list(card_types.types)
+    rng = random.Random(1)
+    for counts in _random_hands(15, seed=1):
+        playable = [key for key in keys if _contained(key, counts)]
+        for last_key in rng.sample(keys, 20):
+            last_type, last_rank = card_types.types[last_key]
+            expected = set()
+            if last_type != type_id['rocket']:
+                for key in playable:
+                    move_type, move_rank = card_types.types[key]
+                    if ((move_type == last_type and move_rank > last_rank)
+                            or (move_type == type_id['bomb'] and last_type != move_type)
+                            or move_type == type_id['rocket']):
+                        expected.add(key)
+            moves = follow_moves(counts, last_key)
+            assert len(moves) == len(set(moves))
+            assert set(moves) == expected
+
+
+def test_key_env_cards():
+    """测试牌型键与环境牌值的互相转换"""
+    cards = [3, 3, 3, 4, 17, 20, 30]
+    assert key_env_cards(env_key(cards)) == cards
+    assert key_env_cards(env_key(list(reversed(cards)))) == cards
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+AI 建议预取测试脚本
+
+对手回合预取的建议在真实局面与预测一致时直接取用，不一致时作废并同步计算。
+"""
+
+import sys
+import os
+
+# 添加项目路径
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from perfectdou.battle_assistant import AdvicePrefetcher, AIAdvisor, GameState, Position
+
+USER_CARDS = [3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 14, 17, 17, 20, 30]
+
+
+def _state_after_user_move():
+    """地主出单张 3 后，轮到地主上家"""
+    state = GameState(Position.LANDLORD)
+    assert state.set_initial_cards(USER_CARDS, [5, 6, 7])
+    assert state.make_move(Position.LANDLORD, [3])
+    return state
+
+
+def test_predict_opponent_responses():
+    """测试预测的局面：两家都过牌，或以看不到的牌中最小的单张压牌"""
+    prefetcher = AdvicePrefetcher(AIAdvisor())
+    predictions = prefetcher.predict(_state_after_user_move())
+    assert len(predictions) == 4
+    moves = [[move.cards for move in state.move_history[1:]] for state in predictions]
+    # 压过单张 3 的最小单张是 4，再压过 4 的是 5
+    assert moves == [[[], []], [[], [4]], [[4], []], [[4], [5]]]
+    assert all(state.current_player == Position.LANDLORD for state in predictions)
+    assert prefetcher.predict(GameState(Position.LANDLORD)) == []
+
+
+def test_prefetched_advice_is_served():
+    """测试预测命中时直接取用预取结果，未命中时作废并同步计算"""
+    prefetcher = AdvicePrefetcher(AIAdvisor())
+    try:
+        state = _state_after_user_move()
+        prefetcher.schedule(state)
+        assert len(prefetcher._pending) == 4
+        assert state.make_move(Position.LANDLORD_UP, [])
+        prefetcher.schedule(state)
+        assert len(prefetcher._pending) == 2
+        assert state.make_move(Position.LANDLORD_DOWN, [])
+        advice = prefetcher.get_advice(state)
+        assert prefetcher.stats == {"hits": 1, "misses": 0, "discarded": 3}
+        assert advice and all(state.get_user_hand().contains(a.cards) for a in advice)
+
+        state = _state_after_user_move()
+        prefetcher.schedule(state)
+        assert state.make_move(Position.LANDLORD_UP, [13])
+        assert state.make_move(Position.LANDLORD_DOWN, [])
+        prefetcher.get_advice(state)
+        assert prefetcher.stats["misses"] == 1 and not prefetcher._pending
+    finally:
+        prefetcher.close()
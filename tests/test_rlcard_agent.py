@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+RLCard 规则智能体测试脚本
+
+基于整数牌型表的 RLCardAgent 必须与原先基于字符串的实现给出完全相同的出牌。
+"""
+
+import sys
+import os
+import copy
+import random
+
+import pytest
+
+# 添加项目路径
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+pytest.importorskip("rlcard")
+
+from perfectdou.cards import rank_key
+from perfectdou.evaluation.card_types import card_type_table
+from perfectdou.evaluation.rlcard_agent import (
+    EnvCard2RealCard, RealCard2EnvCard, RLCardAgent, combine_cards)
+
+
+def legacy_act(position, infoset):
+    """原先的 RLCardAgent.act（会改写传入的 infoset）"""
+    from rlcard.games.doudizhu.utils import CARD_TYPE
+
+    try:
+        hand_cards = infoset.player_hand_cards
+        for i, c in enumerate(hand_cards):
+            hand_cards[i] = EnvCard2RealCard[c]
+        hand_cards = "".join(hand_cards)
+
+        last_move = infoset.last_move.copy()
+        for i, c in enumerate(last_move):
+            last_move[i] = EnvCard2RealCard[c]
+        last_move = "".join(last_move)
+
+        last_two_cards = infoset.last_two_moves
+        for i in range(2):
+            for j, c in enumerate(last_two_cards[i]):
+                last_two_cards[i][j] = EnvCard2RealCard[c]
+            last_two_cards[i] = "".join(last_two_cards[i])
+
+        last_pid = infoset.last_pid
+
+        action = None
+        if last_two_cards[0] == "" and last_two_cards[1] == "":
+            comb = combine_cards(hand_cards)
+            min_card = hand_cards[0]
+            for _, acs in comb.items():
+                for ac in acs:
+                    if min_card in ac:
+                        action = [RealCard2EnvCard[c] for c in ac]
+        else:
+            the_type = CARD_TYPE[0][last_move][0][0]
+            chosen_action = ""
+            rank = 1000
+            for ac in infoset.legal_actions:
+                _ac = "".join(EnvCard2RealCard[c] for c in ac)
+                if _ac != "" and the_type == CARD_TYPE[0][_ac][0][0]:
+                    if int(CARD_TYPE[0][_ac][0][1]) < rank:
+                        rank = int(CARD_TYPE[0][_ac][0][1])
+                        chosen_action = _ac
+            if chosen_action != "":
+                action = [RealCard2EnvCard[c] for c in chosen_action]
+            elif last_pid != "landlord" and position != "landlord":
+                action = []
+
+        if action is None:
+            action = random.choice(infoset.legal_actions)
+    except Exception:
+        action = random.choice(infoset.legal_actions)
+
+    return action
+
+
+def test_card_type_table():
+    """测试牌型表与 RLCard 的 CARD_TYPE 一致"""
+    from rlcard.games.doudizhu.utils import CARD_TYPE
+
+    table = card_type_table()
+    assert len(table.types) == len(CARD_TYPE[0])
+    for cards, entries in CARD_TYPE[0].items():
+        type_id, rank = table.types[rank_key(cards)]
+        assert table.type_names[type_id] == entries[0][0]
+        assert rank == int(entries[0][1])
+
+
+@pytest.mark.parametrize("position", ["landlord", "landlord_up", "landlord_down"])
+def test_rlcard_agent_matches_legacy(position):
+    """测试新旧实现在录制的局面上出牌一致，且不改写 infoset"""
+    pytest.importorskip("perfectdou.env.game")
+    from perfectdou.bench.recording import record_infosets
+
+    agent = RLCardAgent(position)
+    infosets = record_infosets(position, 30, seed=7)
+    assert infosets
+    for index, infoset in enumerate(infosets):
+        before = (list(infoset.player_hand_cards),
+                  copy.deepcopy(infoset.last_two_moves))
+        random.seed(index)
+        expected = legacy_act(position, copy.deepcopy(infoset))
+        random.seed(index)
+        action = agent.act(infoset)
+        assert action == expected
+        assert (infoset.player_hand_cards, infoset.last_two_moves) == before
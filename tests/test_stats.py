@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+"""
+评估统计测试脚本
+
+固定种子的 bootstrap 区间不能依赖各数据块完成的先后顺序。
+"""
+
+import sys
+import os
+
+# 添加项目路径
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from perfectdou.evaluation.stats import bootstrap_mean_interval
+
+
+def test_bootstrap_interval_ignores_insertion_order():
+    """测试同样的比分分布以不同顺序插入时得到相同的区间"""
+    counts = {-4: 30, -2: 250, 2: 400, 4: 60, 8: 12, -8: 3}
+    reordered = dict(reversed(list(counts.items())))
+    assert bootstrap_mean_interval(counts) == bootstrap_mean_interval(reordered)